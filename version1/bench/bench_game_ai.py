@@ -0,0 +1,57 @@
+"""
+Benchmark for the computer opponent, reports search speed in nodes per second.
+
+Run from the version1 directory:
+    python -m bench.bench_game_ai
+"""
+import random
+import numpy as np
+from game.game_ai import GameAI
+from game.game_utils import COLORS, EMPTY_TILE
+import game.game_rules
+
+
+def random_positions(no_games: int = 5, seed: int = 0):
+    """Plays greedy games to collect realistic (board, hand) positions"""
+    rng = random.Random(seed)
+    positions = []
+    ai = GameAI(max_depth=1)
+    for _ in range(no_games):
+        bag = list(range(len(COLORS) ** 2)) * 3
+        rng.shuffle(bag)
+        board = np.full((6, 6), EMPTY_TILE, dtype=np.int8)
+        hand = [bag.pop() for _ in range(6)]
+        while True:
+            positions.append((board, hand))
+            result = ai.search(board, hand, time_budget=1.0)
+            if result.move is None:
+                break
+            board, hand = game.game_rules.apply_move(board, hand, result.move)
+            while len(hand) < 6 and bag:
+                hand.append(bag.pop())
+    return positions
+
+
+def main(time_budget: float = 0.05):
+    positions = random_positions()
+    ai = GameAI(time_budget=time_budget)
+    nodes, elapsed, worst, depths = 0, 0.0, 0.0, []
+    for board, hand in positions:
+        result = ai.search(board, hand)
+        nodes += result.nodes
+        elapsed += result.elapsed
+        worst = max(worst, result.elapsed)
+        depths.append(result.depth)
+    print(f"positions searched: {len(positions)}")
+    print(f"nodes per second:   {nodes / elapsed:,.0f}")
+    print(f"mean depth reached: {np.mean(depths):.2f}")
+    print(
+        f"worst turn:         {worst * 1000:.1f} ms (budget {time_budget * 1000:.0f} ms)"
+    )
+    print(
+        f"table hit rate:     {ai.table.hits / max(1, ai.table.hits + ai.table.misses):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Benchmark for batch simulation, reports game-steps per second for growing batch sizes.
+
+Run from the version1 directory:
+    python -m bench.bench_game_batch
+"""
+import time
+from game.game_batch import BatchGameState
+
+
+def main(batch_sizes: tuple[int, ...] = (1, 16, 256, 4096), seed: int = 0):
+    for no_games in batch_sizes:
+        state = BatchGameState(no_games, seed=seed)
+        game_steps = 0
+        start = time.perf_counter()
+        while not state.finished.all():
+            game_steps += state.step_random()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{no_games:>6} games: {game_steps / elapsed:>12,.0f} game-steps/s"
+            f"  ({game_steps} steps in {elapsed:.2f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
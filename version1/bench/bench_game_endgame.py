@@ -0,0 +1,51 @@
+"""
+Benchmark for the endgame solver, reports nodes per second and how many positions
+were solved exactly within the budget.
+
+Run from the version1 directory:
+    python -m bench.bench_game_endgame
+"""
+import numpy as np
+from game.game_ai import GameAI
+from game.game_endgame import EndgameSolver
+import game.game_rules
+from bench.bench_game_ai import random_positions
+
+
+def greedy_value(board, hand) -> int:
+    """Points from playing the best scoring move until no move is left"""
+    ai = GameAI(max_depth=1)
+    value = 0
+    while True:
+        result = ai.search(board, hand, time_budget=1.0)
+        if result.move is None:
+            return value
+        value += result.score
+        board, hand = game.game_rules.apply_move(board, hand, result.move)
+
+
+def main(time_budget: float = 1.0, max_nodes: int | None = None):
+    positions = random_positions(no_games=10)
+    solver = EndgameSolver(time_budget=time_budget, max_nodes=max_nodes)
+    nodes, elapsed, worst, solved, gains = 0, 0.0, 0.0, 0, []
+    for board, hand in positions:
+        result = solver.solve(board, hand)
+        nodes += result.nodes
+        elapsed += result.elapsed
+        worst = max(worst, result.elapsed)
+        solved += result.complete
+        gains.append(result.value - greedy_value(board, hand))
+    print(f"positions solved:   {solved} / {len(positions)}")
+    print(f"nodes per second:   {nodes / elapsed:,.0f}")
+    print(f"mean nodes:         {nodes / len(positions):,.0f}")
+    print(
+        f"worst solve:        {worst * 1000:.1f} ms (budget {time_budget * 1000:.0f} ms)"
+    )
+    print(f"gain over greedy:   {np.mean(gains):.2f} points")
+    print(
+        f"table hit rate:     {solver.table.hits / max(1, solver.table.hits + solver.table.misses):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for the game state feed: hundreds of games stepped together, every move
+encoded and fanned out to local subscribers.
+
+Run from the version1 directory:
+    python -m bench.bench_game_feed
+"""
+import socket
+import time
+import game.game_feed
+from game.game_batch import BatchGameState
+
+
+def main(no_games: int = 500, no_subscribers: int = 32, keyframe_interval: int = 60):
+    games = BatchGameState(no_games, seed=0)
+    encoders = [
+        game.game_feed.FeedEncoder(game_id, keyframe_interval)
+        for game_id in range(no_games)
+    ]
+    hub = game.game_feed.FeedHub(max_backlog=2**24)
+    connections = []
+    for _ in range(no_subscribers):
+        hub_end, connection = socket.socketpair()
+        connection.setblocking(False)
+        hub.subscribe(hub_end)
+        connections.append(connection)
+    decoders = [game.game_feed.FeedDecoder() for _ in connections]
+
+    encode_time, publish_time, messages, sent_bytes = 0.0, 0.0, 0, 0
+    steps = 0
+    while True:
+        boards = games.boards.reshape(no_games, -1).tolist()
+        hands = games.hand_codes.tolist()
+        bag_counts = games.bag_counts.tolist()
+        start = time.perf_counter()
+        encoded = [
+            encoder.encode(cells, hand, bag_count)
+            for encoder, cells, hand, bag_count in zip(
+                encoders, boards, hands, bag_counts
+            )
+        ]
+        encode_time += time.perf_counter() - start
+        start = time.perf_counter()
+        for message in encoded:
+            if message is not None:
+                hub.publish(message)
+                messages += 1
+                sent_bytes += len(message)
+        hub.pump()
+        publish_time += time.perf_counter() - start
+        # Subscribers read what arrived
+        for connection, decoder in zip(connections, decoders):
+            while True:
+                try:
+                    decoder.feed(connection.recv(2**20))
+                except BlockingIOError:
+                    break
+        if games.finished.all():
+            break
+        games.step_random()
+        steps += 1
+
+    in_sync = all(
+        decoder.games[game_id].cells == boards[game_id]
+        for decoder in decoders
+        for game_id in range(no_games)
+    )
+    print(f"games / subscribers: {no_games} / {len(hub.subscribers)}")
+    print(f"steps played:        {steps}")
+    print(f"messages published:  {messages:,} ({sent_bytes / messages:.1f} bytes each)")
+    print(f"encode per message:  {encode_time / messages * 1e6:.1f} us")
+    print(f"fan-out per message: {publish_time / messages * 1e6:.1f} us")
+    print(f"messages per second: {messages / (encode_time + publish_time):,.0f}")
+    print(f"subscribers in sync: {in_sync}")
+    hub.close()
+    for connection in connections:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
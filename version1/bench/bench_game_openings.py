@@ -0,0 +1,45 @@
+"""
+Benchmark for the opening table, compares a lookup with searching the opening.
+Build the table first: python -m game.game_openings
+
+Run from the version1 directory:
+    python -m bench.bench_game_openings [table path]
+"""
+import random
+import sys
+import time
+import numpy as np
+from game.game_ai import GameAI
+from game.game_utils import COLORS, EMPTY_TILE
+import game.game_openings
+
+
+def main(path: str = game.game_openings.DEFAULT_PATH, no_hands: int = 200):
+    table = game.game_openings.load_table(path)
+    if table is None:
+        print(
+            f"No opening table at {path}, build it with: python -m game.game_openings"
+        )
+        return
+    rng = random.Random(0)
+    bag = list(range(len(COLORS) ** 2)) * 3
+    hands = [rng.sample(bag, 6) for _ in range(no_hands)]
+    board = np.full((6, 6), EMPTY_TILE, dtype=np.int8)
+
+    start = time.perf_counter()
+    openings = [table.lookup(hand) for hand in hands]
+    lookup_time = (time.perf_counter() - start) / no_hands
+
+    ai = GameAI()
+    search_time = sum(ai.search(board, hand).elapsed for hand in hands)
+    print(f"table entries:      {len(table.table)} slots")
+    print(f"lookup per hand:    {lookup_time * 1e6:.1f} us")
+    print(f"search per hand:    {search_time / no_hands * 1000:.1f} ms")
+    print(f"hands found:        {sum(opening is not None for opening in openings)}")
+    print(
+        f"proven optimal:     {np.mean([opening.complete for opening in openings if opening]):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
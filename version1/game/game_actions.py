@@ -4,12 +4,15 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     import game.game_setup
+    import game.game_history
+    import game.game_animation
     import numpy as np
 
 import pyglet
 from shapely.geometry import Point
 from shapely.geometry.polygon import Polygon
 from game.game_utils import TileStatus, SpaceStatus
+from game.game_history import tile_state
 
 ### Defines how board reacts to user actions
 
@@ -45,17 +48,22 @@ def is_board_space_selected(
 def snap_tile_to_board_space(
     player_hand: list[game.game_setup.GamePieceSprite],
     board_spaces: np.ndarray,
+    tweens: game.game_animation.TweenEngine | None = None,
 ):
     """_summary_
 
     Args:
         player_hand (game_setup.PlayerHand): Tiles in a players hand
         board_spaces (game_setup.GameBoard): Current state of game board
+        tweens (game.game_animation.TweenEngine | None): glide tiles onto spaces
+            with these, if None tiles jump there
     """
     for tile in player_hand:
         # If Tile is current active (held by player cursor)
         if tile.active:
+            snapped_to = tile.board_coord
             tile.tile_status = TileStatus.Hand
+            tile.board_coord = None
             # And dragging tile over a board space
             for y_space_coord in range(board_spaces.shape[0]):
                 for x_space_coord in range(board_spaces.shape[1]):
@@ -65,11 +73,20 @@ def snap_tile_to_board_space(
                         draw_group = 48 - (y_space_coord + x_space_coord + 2) * 2
                         tile.block.group = pyglet.graphics.OrderedGroup(draw_group)
                         # Align tile to bottom corner so it snaps to board space
-                        tile.update(
-                            x=current_space.vertex_list[0][0],
-                            y=current_space.vertex_list[0][1],
-                        )
+                        x, y = current_space.vertex_list[0]
+                        if snapped_to != (x_space_coord, y_space_coord):
+                            if tweens is None:
+                                tile.update(x=x, y=y)
+                            else:
+                                tweens.add(tile, x=x, y=y)
+                        elif tweens is None or tile not in tweens:
+                            # Hold it on the space once its tween is done
+                            tile.update(x=x, y=y)
                         tile.tile_status = TileStatus.BoardThinking
+                        tile.board_coord = (x_space_coord, y_space_coord)
+            # Off the board again, the tile follows the mouse
+            if tweens is not None and tile.board_coord is None:
+                tweens.cancel(tile)
 
 
 def click_tile_make_active(
@@ -97,12 +114,17 @@ def click_tile_make_active(
         ) and (current_sprite_y_bounds[0] < mouse_y < current_sprite_y_bounds[1])
 
         if game_piece.active:
+            # Remember where the tile came from so the move can be undone
+            game_piece.drag_origin = tile_state(game_piece)
             game_piece.update(scale=game_piece.scale * 2)
 
 
 # TODO Move this function to on_release for game board and then use the sum of board space indices to determine draw group
 def deactivate_tiles(
-    game_piece: game.game_setup.GamePieceSprite, draw_group: int | None
+    game_piece: game.game_setup.GamePieceSprite,
+    draw_group: int | None,
+    history: game.game_history.MoveHistory | None = None,
+    tweens: game.game_animation.TweenEngine | None = None,
 ):
     # Once you let go of mouse, tile is no longer active
     if game_piece.active:
@@ -110,12 +132,26 @@ def deactivate_tiles(
         # If tile was over a board space, it is now officially placed
         if game_piece.tile_status is TileStatus.BoardThinking:
             game_piece.tile_status = TileStatus.BoardPlaced
+            game_piece.game_piece_info.tile_status = TileStatus.BoardPlaced
             game_piece.block.group = pyglet.graphics.OrderedGroup(draw_group)
             # TODO: replace this with a function that draws new tiles and removes them from the tile pool
         # If tile isn't on a board spot, return it to scale
         else:
             game_piece.block.group = pyglet.graphics.OrderedGroup(49)
-            game_piece.update(scale=game_piece.scale / 2)
+            if tweens is None:
+                game_piece.update(scale=game_piece.scale / 2)
+            else:
+                tweens.add(game_piece, scale=game_piece.scale / 2)
+        # Either way, record the move so it can be undone, unless the tile didn't move.
+        # A moving tile is recorded where it will come to rest.
+        after = tile_state(game_piece, tweens)
+        if (
+            history is not None
+            and game_piece.drag_origin is not None
+            and after != game_piece.drag_origin
+        ):
+            history.record(game_piece, game_piece.drag_origin, after)
+        game_piece.drag_origin = None
 
 
 def update_game_piece(
@@ -126,17 +162,23 @@ def update_game_piece(
     scale: int | None = None,
     scale_x: int | None = None,
     scale_y: int | None = None,
+    refile: bool = True,
 ):
+    # refile=False leaves the tile filed where it was in its TilePicker, for moves
+    # that are re-filed once they're done (see TweenEngine)
+    if (x, y, rotation, scale, scale_x, scale_y) == (None,) * 6:
+        return
     for sprite in [game_piece, game_piece.gem, game_piece.block]:
-        if y is not None:
-            sprite.y = y
-        if x is not None:
-            sprite.x = x
-        if rotation is not None:
-            sprite.rotation = rotation
-        if scale is not None:
-            sprite.scale = scale
-        if scale_x is not None:
-            sprite.scale_x = scale_x
-        if scale_y is not None:
-            sprite.scale_y = scale_y
+        # Sprite.update moves the vertices once for all attributes, instead of once per attribute
+        pyglet.sprite.Sprite.update(
+            sprite,
+            x=x,
+            y=y,
+            rotation=rotation,
+            scale=scale,
+            scale_x=scale_x,
+            scale_y=scale_y,
+        )
+    # Keep the tile findable by mouse clicks
+    if refile and game_piece.tile_picker is not None:
+        game_piece.tile_picker.move(game_piece)
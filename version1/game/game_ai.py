@@ -0,0 +1,279 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections import OrderedDict
+import time
+
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE
+import game.game_rules
+
+if TYPE_CHECKING:
+    import game.game_setup
+    import game.game_openings
+
+### Computer opponent: looks ahead over its own hand within a time budget
+
+
+class ZobristKeys:
+    """
+    Random 64 bit keys used to hash a board plus hand.
+    Hashes are XORs of one key per (cell, tile) on the board and one key per
+    copy of a tile in hand, so they can be updated one tile at a time.
+    """
+
+    def __init__(self, no_cells: int = 36, hand_size: int = 6, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        no_codes = len(COLORS) ** 2
+        self.board_keys = rng.integers(
+            0, 2**63, size=(no_cells, no_codes), dtype=np.int64
+        ).tolist()
+        self.hand_keys = rng.integers(
+            0, 2**63, size=(no_codes, hand_size), dtype=np.int64
+        ).tolist()
+
+    def hash(self, cells: list[int], hand: list[int]) -> int:
+        """Hash a full position from scratch"""
+        h = 0
+        for cell, code in enumerate(cells):
+            if code != EMPTY_TILE:
+                h ^= self.board_keys[cell][code]
+        for code in set(hand):
+            for copy in range(hand.count(code)):
+                h ^= self.hand_keys[code][copy]
+        return h
+
+
+class TranspositionTable:
+    """
+    Bounded cache of searched positions, least recently used entries are evicted first
+    """
+
+    def __init__(self, capacity: int = 2**16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class SearchResult:
+    """
+    Move picked by a search and how it was found
+    """
+
+    def __init__(
+        self,
+        move: tuple[tuple[int, int, int], ...] | None,
+        score: int,
+        value: int,
+        depth: int,
+        nodes: int,
+        elapsed: float,
+    ):
+        self.move = move  # (x, y, tile code) placements, None if no move is possible
+        self.score = score  # points the move earns right away
+        self.value = value  # points including the lookahead
+        self.depth = depth  # number of own moves fully searched
+        self.nodes = nodes
+        self.elapsed = elapsed  # seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class GameAI:
+    """
+    Picks moves by iterative deepening over its own hand.
+    Depth 1 is the greedy best move, each extra depth plays another move
+    from the tiles left in hand (no refill is assumed). Positions reached
+    by different move orders share one transposition table entry.
+    Opening moves are read from an opening table instead, if one is given.
+    """
+
+    def __init__(
+        self,
+        tiles_per_row: int = 6,
+        hand_size: int = 6,
+        time_budget: float = 0.05,
+        max_depth: int = 3,
+        table_size: int = 2**16,
+        seed: int = 0,
+        openings: game.game_openings.OpeningTable | None = None,
+    ):
+        self.tiles_per_row = tiles_per_row
+        self.time_budget = time_budget  # seconds per turn
+        self.max_depth = max_depth
+        self.keys = ZobristKeys(tiles_per_row**2, hand_size, seed)
+        self.table = TranspositionTable(table_size)
+        self.openings = openings  # precomputed best first moves, see game_openings
+        self.nodes = 0
+        self._deadline = 0.0
+
+    def search(
+        self,
+        board: np.ndarray,
+        hand: list[int],
+        time_budget: float | None = None,
+        max_depth: int | None = None,
+    ) -> SearchResult:
+        """
+        Find the best move available within the time budget
+
+        Args:
+            board (np.ndarray): tiles_per_row x tiles_per_row array of tile codes
+            hand (list[int]): tile codes in hand
+            time_budget (float | None): seconds to search, defaults to self.time_budget
+            max_depth (int | None): deepest lookahead, defaults to self.max_depth
+
+        Returns:
+            SearchResult: best move found by the deepest finished search
+        """
+        start = time.perf_counter()
+        self._deadline = start + (
+            self.time_budget if time_budget is None else time_budget
+        )
+        max_depth = self.max_depth if max_depth is None else max_depth
+        self.nodes = 0
+
+        cells = board.ravel().tolist()
+        hand = sorted(hand)
+        if self.openings is not None and all(code == EMPTY_TILE for code in cells):
+            opening = self.openings.lookup(hand)
+            if opening is not None and opening.move:
+                return SearchResult(
+                    opening.move,
+                    opening.score,
+                    opening.value,
+                    opening.depth,
+                    0,
+                    time.perf_counter() - start,
+                )
+        h = self.keys.hash(cells, hand)
+
+        # Depth 1: score every move, stop early if we run out of time
+        root_moves = []
+        try:
+            for move in game.game_rules.iter_cell_moves(
+                cells, self.tiles_per_row, hand
+            ):
+                self._tick()
+                root_moves.append((self._score(cells, move), move))
+        except _SearchTimeout:
+            pass
+        if not root_moves:
+            return SearchResult(None, 0, 0, 0, self.nodes, time.perf_counter() - start)
+        root_moves.sort(key=lambda scored: scored[0], reverse=True)
+        best_score, best_move = root_moves[0]
+        best_value, depth = best_score, 1
+
+        # Deeper: keep the result of the last search that finished in time
+        for next_depth in range(2, max_depth + 1):
+            try:
+                value, move = self._search_root(
+                    list(cells), hand, h, root_moves, next_depth
+                )
+            except _SearchTimeout:
+                break
+            best_value, best_move, depth = value, move, next_depth
+            best_score = self._score(cells, move)
+
+        return SearchResult(
+            tuple(
+                (*divmod(cell, self.tiles_per_row), code) for cell, code in best_move
+            ),
+            best_score,
+            best_value,
+            depth,
+            self.nodes,
+            time.perf_counter() - start,
+        )
+
+    def choose_move(
+        self, game_board: game.game_setup.GameBoard, time_budget: float | None = None
+    ) -> SearchResult:
+        """Search from the tiles currently on a game board and in the player's hand"""
+        board, hand = game.game_rules.state_from_game_board(game_board)
+        return self.search(board, hand, time_budget)
+
+    def _tick(self):
+        self.nodes += 1
+        if time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+    def _score(self, cells, move) -> int:
+        cells = list(cells)
+        for cell, code in move:
+            cells[cell] = code
+        return game.game_rules.score_cells(
+            cells, self.tiles_per_row, [cell for cell, _ in move]
+        )
+
+    def _play(self, cells, hand, h, move):
+        """Play move into cells in place, return the new hand and hash"""
+        hand = list(hand)
+        for cell, code in move:
+            h ^= self.keys.hand_keys[code][hand.count(code) - 1]
+            hand.remove(code)
+            cells[cell] = code
+            h ^= self.keys.board_keys[cell][code]
+        return hand, h
+
+    def _search_root(self, cells, hand, h, root_moves, depth):
+        best_value, best_move = -1, None
+        for score, move in root_moves:
+            next_hand, next_h = self._play(cells, hand, h, move)
+            value = score + self._value(cells, next_hand, next_h, depth - 1)
+            for cell, _ in move:
+                cells[cell] = EMPTY_TILE
+            if value > best_value:
+                best_value, best_move = value, move
+        self.table.put((h, depth), (best_value, best_move))
+        return best_value, best_move
+
+    def _value(self, cells, hand, h, depth) -> int:
+        """Most points that can be scored in depth more moves"""
+        if depth == 0 or not hand:
+            return 0
+        self._tick()
+        entry = self.table.get((h, depth))
+        if entry is not None:
+            return entry[0]
+        best_value, best_move = 0, None
+        for move in game.game_rules.iter_cell_moves(cells, self.tiles_per_row, hand):
+            self._tick()
+            score = self._score(cells, move)
+            next_hand, next_h = self._play(cells, hand, h, move)
+            value = score + self._value(cells, next_hand, next_h, depth - 1)
+            for cell, _ in move:
+                cells[cell] = EMPTY_TILE
+            if value > best_value:
+                best_value, best_move = value, move
+        self.table.put((h, depth), (best_value, best_move))
+        return best_value
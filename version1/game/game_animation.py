@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import enum
+
+import numpy as np
+import game.game_actions
+
+if TYPE_CHECKING:
+    import game.game_setup
+
+### Tile movement tweens, all advanced together in one NumPy step per frame
+
+
+class Easing(enum.IntEnum):
+    Linear = 0
+    EaseInQuad = 1
+    EaseOutQuad = 2
+    EaseInOutQuad = 3
+
+
+def ease(t: np.ndarray, easing: np.ndarray) -> np.ndarray:
+    """
+    Apply each tween's easing curve to its progress
+
+    Args:
+        t (np.ndarray): progress of each tween, 0 to 1
+        easing (np.ndarray): Easing id of each tween
+
+    Returns:
+        np.ndarray: eased progress, 0 to 1
+    """
+    return np.select(
+        [
+            easing == Easing.EaseInQuad,
+            easing == Easing.EaseOutQuad,
+            easing == Easing.EaseInOutQuad,
+        ],
+        [t * t, t * (2 - t), np.where(t < 0.5, 2 * t * t, -1 + (4 - 2 * t) * t)],
+        default=t,
+    )
+
+
+def _refile(game_piece: game.game_setup.GamePieceSprite):
+    """File a tile that stopped moving where it is now"""
+    if game_piece.tile_picker is not None:
+        game_piece.tile_picker.move(game_piece)
+
+
+class TweenEngine:
+    """
+    Active tweens stored as rows of NumPy arrays (x, y & scale start/end, duration, easing).
+    update() advances every tween at once, moves the tiles' sprites and drops the tweens
+    that finished. A moving tile is only re-filed in its TilePicker once it stops,
+    so clicks may miss it on the way. A tile has at most one tween, a new one replaces it.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.size = 0
+        self.targets = []  # tile moved by each row
+        self.rows = {}  # tile -> row
+        self.start = np.zeros((capacity, 3))  # x, y, scale
+        self.end = np.zeros((capacity, 3))
+        self.elapsed = np.zeros(capacity)
+        self.duration = np.ones(capacity)
+        self.easing = np.zeros(capacity, dtype=np.int8)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, game_piece):
+        return game_piece in self.rows
+
+    def add(
+        self,
+        game_piece: game.game_setup.GamePieceSprite,
+        x: float | None = None,
+        y: float | None = None,
+        scale: float | None = None,
+        duration: float = 0.15,
+        easing: Easing = Easing.EaseOutQuad,
+    ):
+        """
+        Start moving a tile from where it is now
+
+        Args:
+            game_piece (game.game_setup.GamePieceSprite): tile to move
+            x (float | None): final x, unchanged if None
+            y (float | None): final y, unchanged if None
+            scale (float | None): final scale, unchanged if None
+            duration (float): seconds the move takes, 0 moves it right away
+            easing (Easing): speed curve of the move
+        """
+        start = (game_piece.x, game_piece.y, game_piece.scale)
+        end = tuple(
+            current if target is None else target
+            for current, target in zip(start, (x, y, scale))
+        )
+        if duration <= 0:
+            self.cancel(game_piece)
+            game.game_actions.update_game_piece(
+                game_piece, x=end[0], y=end[1], scale=end[2]
+            )
+            return
+
+        row = self.rows.get(game_piece)
+        if row is None:
+            if self.size == len(self.elapsed):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.targets.append(game_piece)
+            self.rows[game_piece] = row
+        self.start[row] = start
+        self.end[row] = end
+        self.elapsed[row] = 0.0
+        self.duration[row] = duration
+        self.easing[row] = easing
+
+    def target(
+        self, game_piece: game.game_setup.GamePieceSprite
+    ) -> tuple[float, float, float] | None:
+        """Where a tile's tween ends as (x, y, scale), None if the tile isn't moving"""
+        row = self.rows.get(game_piece)
+        return None if row is None else tuple(self.end[row].tolist())
+
+    def finish(self, game_piece: game.game_setup.GamePieceSprite):
+        """Jump a tile to the end of its tween, e.g. when the player grabs the tile"""
+        end = self.target(game_piece)
+        if end is None:
+            return
+        game.game_actions.update_game_piece(
+            game_piece, x=end[0], y=end[1], scale=end[2], refile=False
+        )
+        self.cancel(game_piece)
+
+    def cancel(self, game_piece: game.game_setup.GamePieceSprite):
+        """Stop a tile's tween where it is"""
+        row = self.rows.pop(game_piece, None)
+        if row is None:
+            return
+        _refile(game_piece)
+        # Move the last row into the gap
+        last = self.size - 1
+        if row != last:
+            for array in (
+                self.start,
+                self.end,
+                self.elapsed,
+                self.duration,
+                self.easing,
+            ):
+                array[row] = array[last]
+            self.targets[row] = self.targets[last]
+            self.rows[self.targets[row]] = row
+        self.targets.pop()
+        self.size -= 1
+
+    def update(self, dt: float):
+        """
+        Advance every tween by dt seconds
+
+        Args:
+            dt (float): seconds since the last update
+        """
+        if not self.size:
+            return
+        size = self.size
+        self.elapsed[:size] += dt
+        t = np.minimum(self.elapsed[:size] / self.duration[:size], 1.0)
+        start = self.start[:size]
+        values = (
+            start + (self.end[:size] - start) * ease(t, self.easing[:size])[:, None]
+        )
+        for game_piece, (x, y, scale) in zip(self.targets, values.tolist()):
+            game.game_actions.update_game_piece(
+                game_piece, x=x, y=y, scale=scale, refile=False
+            )
+
+        # Drop finished tweens, keeping the rest packed at the front
+        finished = t >= 1.0
+        if finished.any():
+            keep = np.nonzero(~finished)[0]
+            for array in (
+                self.start,
+                self.end,
+                self.elapsed,
+                self.duration,
+                self.easing,
+            ):
+                array[: len(keep)] = array[keep]
+            for row in np.nonzero(finished)[0]:
+                game_piece = self.targets[row]
+                del self.rows[game_piece]
+                _refile(game_piece)
+            self.targets = [self.targets[row] for row in keep]
+            self.size = len(keep)
+            for row, game_piece in enumerate(self.targets):
+                self.rows[game_piece] = row
+
+    def _grow(self):
+        for name in ("start", "end", "elapsed", "duration", "easing"):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
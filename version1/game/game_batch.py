@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE, TileStatus, SpaceStatus
+from game.game_rules import LINE_BONUS
+
+### Many games stepped in lockstep with NumPy, for tuning and RL experiments
+# Same rules as game_rules, but every step places a single tile per game so a step
+# can be applied to all games at once. Tile codes are the ones from game_utils.tile_code
+
+
+class LineStats:
+    """
+    For every board space, describes the run of touching tiles leading up to it from one direction
+    """
+
+    def __init__(
+        self, length: np.ndarray, block: np.ndarray, gem: np.ndarray, codes: np.ndarray
+    ):
+        self.length = length  # number of tiles in the run
+        self.block = block  # shared block color index, -1 for no run, -2 if mixed
+        self.gem = gem  # shared gem color index, -1 for no run, -2 if mixed
+        self.codes = codes  # bitmask of the tile codes in the run
+
+
+def _runs_before(lines: np.ndarray) -> LineStats:
+    """
+    Scan N x M lines of tiles along axis 0, collecting the run that ends just before each space
+    """
+    no_colors = len(COLORS)
+    occupied = lines != EMPTY_TILE
+    tile_blocks = lines // no_colors
+    tile_gems = lines % no_colors
+    tile_bits = np.where(
+        occupied, np.left_shift(1, np.maximum(lines, 0).astype(np.int64)), 0
+    )
+    length = np.zeros(lines.shape, dtype=np.int8)
+    block = np.full(lines.shape, -1, dtype=np.int8)
+    gem = np.full(lines.shape, -1, dtype=np.int8)
+    codes = np.zeros(lines.shape, dtype=np.int64)
+    # Loop over the board width only, every game and line is handled at once
+    for pos in range(1, lines.shape[0]):
+        occupied_prev = occupied[pos - 1]
+        started = length[pos - 1] > 0
+        length[pos] = np.where(occupied_prev, length[pos - 1] + 1, 0)
+        for shared, attributes in ((block, tile_blocks), (gem, tile_gems)):
+            attribute = attributes[pos - 1]
+            shared[pos] = np.where(
+                occupied_prev,
+                np.where(~started | (shared[pos - 1] == attribute), attribute, -2),
+                -1,
+            )
+        codes[pos] = np.where(occupied_prev, codes[pos - 1] | tile_bits[pos - 1], 0)
+    return LineStats(length, block, gem, codes)
+
+
+def line_stats(boards: np.ndarray) -> list[tuple[LineStats, LineStats]]:
+    """
+    Runs on both sides of every space, along x then along y
+
+    Args:
+        boards (np.ndarray): G x N x N tile codes, indexed [game, x, y]
+
+    Returns:
+        list[tuple[LineStats, LineStats]]: (before, after) runs for the x and the y axis
+    """
+    no_games, tiles_per_row = boards.shape[:2]
+    stats = []
+    # Put the scanned axis first so each scan step reads contiguous memory
+    for to_lines, from_lines in (((1, 0, 2), (1, 0, 2)), ((2, 0, 1), (1, 2, 0))):
+        lines = np.ascontiguousarray(boards.transpose(to_lines)).reshape(
+            tiles_per_row, -1
+        )
+        runs = []
+        for flip in (slice(None), slice(None, None, -1)):
+            run = _runs_before(lines[flip])
+            runs.append(
+                LineStats(
+                    *(
+                        array[flip]
+                        .reshape(tiles_per_row, no_games, tiles_per_row)
+                        .transpose(from_lines)
+                        for array in (run.length, run.block, run.gem, run.codes)
+                    )
+                )
+            )
+        stats.append(tuple(runs))
+    return stats
+
+
+def _attribute_masks(attribute_of) -> np.ndarray:
+    """
+    Lookup table from a run's shared attribute (-2 mixed, -1 no run, 0.. color index)
+    to the bitmask of tile codes with that attribute, offset by 2
+    """
+    no_colors = len(COLORS)
+    table = [0, (1 << no_colors**2) - 1]
+    for color in range(no_colors):
+        table.append(
+            sum(
+                1 << code
+                for code in range(no_colors**2)
+                if attribute_of(code) == color
+            )
+        )
+    return np.array(table, dtype=np.int64)
+
+
+BLOCK_MASKS = _attribute_masks(lambda code: code // len(COLORS))
+GEM_MASKS = _attribute_masks(lambda code: code % len(COLORS))
+
+
+def allowed_codes(before: LineStats, after: LineStats) -> np.ndarray:
+    """
+    Bitmask of the tile codes that make a valid line between the before and after runs
+    """
+    allowed = np.zeros(before.length.shape, dtype=np.int64)
+    for masks, before_shared, after_shared in (
+        (BLOCK_MASKS, before.block, after.block),
+        (GEM_MASKS, before.gem, after.gem),
+    ):
+        shared = np.where(before_shared == -1, after_shared, before_shared)
+        consistent = (after_shared == -1) | (after_shared == shared)
+        allowed |= np.where(consistent, masks[shared + 2], 0)
+    # No tile may repeat in the joined line
+    allowed &= ~(before.codes | after.codes)
+    return np.where(before.codes & after.codes == 0, allowed, 0)
+
+
+class BatchGameState:
+    """
+    Boards, bags and hands for G games as arrays.
+    Each game's bag is shuffled once and drawn from the front, tiles are
+    identified by their position in that bag so TileStatus can be tracked per tile.
+    """
+
+    def __init__(
+        self,
+        no_games: int,
+        tiles_per_row: int = 6,
+        hand_size: int = 6,
+        no_sets: int = 3,
+        seed: int | None = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.no_games = no_games
+        self.tiles_per_row = tiles_per_row
+        self.hand_size = hand_size
+        no_codes = len(COLORS) ** 2
+        no_tiles = no_codes * no_sets
+
+        # Shuffle every bag at once
+        self.bags = (
+            np.argsort(self.rng.random((no_games, no_tiles)), axis=1) % no_codes
+        ).astype(np.int8)
+        self.bag_pos = np.zeros(no_games, dtype=np.int64)  # next tile to draw
+        self.tile_status = np.full(
+            (no_games, no_tiles), TileStatus.Bag.value, dtype=np.int8
+        )
+        self.boards = np.full(
+            (no_games, tiles_per_row, tiles_per_row), EMPTY_TILE, dtype=np.int8
+        )
+        self.hands = np.full((no_games, hand_size), -1, dtype=np.int64)  # bag positions
+        self.scores = np.zeros(no_games, dtype=np.int64)
+        self.finished = np.zeros(no_games, dtype=bool)
+        self._stats = None  # line_stats of the current boards, shared by mask & score
+        self.refill()
+
+    @property
+    def hand_codes(self) -> np.ndarray:
+        """G x hand_size tile codes, EMPTY_TILE for empty slots"""
+        codes = np.take_along_axis(self.bags, np.maximum(self.hands, 0), axis=1)
+        return np.where(self.hands >= 0, codes, EMPTY_TILE)
+
+    @property
+    def bag_counts(self) -> np.ndarray:
+        return self.bags.shape[1] - self.bag_pos
+
+    def space_status(self) -> np.ndarray:
+        """G x N x N SpaceStatus values"""
+        return np.where(
+            self.boards == EMPTY_TILE,
+            SpaceStatus.Free.value,
+            SpaceStatus.Occupied.value,
+        ).astype(np.int8)
+
+    def refill(self):
+        """Fill every empty hand slot from the front of its bag"""
+        empty = self.hands < 0
+        rank = np.cumsum(empty, axis=1) - 1
+        drawn = self.bag_pos[:, None] + rank
+        fill = empty & (drawn < self.bags.shape[1])
+        self.hands = np.where(fill, drawn, self.hands)
+        self.bag_pos += fill.sum(axis=1)
+        games, slots = np.nonzero(fill)
+        self.tile_status[games, self.hands[games, slots]] = TileStatus.Hand.value
+
+    def legal_mask(self) -> np.ndarray:
+        """
+        Which hand slot can go on which space
+
+        Returns:
+            np.ndarray: G x hand_size x N*N booleans
+        """
+        stats = self.line_stats()
+        codes = self.hand_codes
+        occupied = self.boards != EMPTY_TILE
+        touches = np.zeros_like(occupied)
+        allowed = np.full(occupied.shape, -1, dtype=np.int64)
+        for before, after in stats:
+            touches |= (before.length > 0) | (after.length > 0)
+            allowed &= allowed_codes(before, after)
+        playable = ~occupied & (touches | ~occupied.any(axis=(1, 2))[:, None, None])
+        allowed = np.where(playable, allowed, 0)[:, None]
+        mask = (
+            np.right_shift(allowed, np.maximum(codes, 0)[:, :, None, None]) & 1
+        ).astype(bool) & (codes != EMPTY_TILE)[:, :, None, None]
+        return mask.reshape(self.no_games, self.hand_size, -1)
+
+    def line_stats(self) -> list[tuple[LineStats, LineStats]]:
+        """line_stats of the boards, only recomputed after the boards change"""
+        if self._stats is None:
+            self._stats = line_stats(self.boards)
+        return self._stats
+
+    def score_moves(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Points for placing a tile on each game's cell, -1 cells score 0
+
+        Args:
+            cells (np.ndarray): G flat space indices, x * N + y
+
+        Returns:
+            np.ndarray: G scores
+        """
+        stats = self.line_stats()
+        games = np.arange(self.no_games)
+        x, y = np.divmod(np.maximum(cells, 0), self.tiles_per_row)
+        score = np.zeros(self.no_games, dtype=np.int64)
+        for before, after in stats:
+            length = (
+                before.length[games, x, y].astype(np.int64)
+                + after.length[games, x, y]
+                + 1
+            )
+            score += np.where(length > 1, length, 0)
+            score += np.where(length == len(COLORS), LINE_BONUS, 0)
+        return np.where(cells >= 0, np.maximum(score, 1), 0)
+
+    def apply_moves(self, slots: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        """
+        Place one tile per game, then refill hands. Games with slot -1 pass.
+        Moves are assumed legal, check them with legal_mask.
+
+        Args:
+            slots (np.ndarray): G hand slots to play from
+            cells (np.ndarray): G flat space indices to play on
+
+        Returns:
+            np.ndarray: G points scored by the moves
+        """
+        playing = slots >= 0
+        games = np.nonzero(playing)[0]
+        cells = np.where(playing, cells, -1)
+        scores = self.score_moves(cells)
+        tiles = self.hands[games, slots[games]]
+        x, y = np.divmod(cells[games], self.tiles_per_row)
+        self.boards[games, x, y] = self.bags[games, tiles]
+        self._stats = None
+        self.tile_status[games, tiles] = TileStatus.BoardPlaced.value
+        self.hands[games, slots[games]] = -1
+        self.scores += scores
+        self.refill()
+        return scores
+
+    def random_moves(
+        self, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Pick a uniformly random legal move per game, (-1, -1) when there is none.
+        Games without a legal move are marked finished.
+        """
+        mask = self.legal_mask() if mask is None else mask
+        flat = mask.reshape(self.no_games, -1)
+        noise = np.where(flat, self.rng.random(flat.shape), -1.0)
+        picks = noise.argmax(axis=1)
+        has_move = flat.any(axis=1)
+        self.finished |= ~has_move
+        slots, cells = np.divmod(picks, self.tiles_per_row**2)
+        return np.where(has_move, slots, -1), np.where(has_move, cells, -1)
+
+    def step_random(self) -> int:
+        """Play a random legal move in every game, returns the number of games that moved"""
+        slots, cells = self.random_moves()
+        self.apply_moves(slots, cells)
+        return int((slots >= 0).sum())
@@ -0,0 +1,187 @@
+import ctypes
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pyglet
+from game.game_utils import COLORS
+
+### Pre-packed texture bundle, so launching the game doesn't decode PNGs
+# bake() decodes every tile and board image once and writes them into one raw RGBA
+# atlas (BUNDLE_DATA) plus a small JSON index (BUNDLE_INDEX) next to the PNGs.
+# At runtime image() memory maps the atlas and uploads it as a single texture.
+# If the bundle is missing, or a PNG changed since it was baked, the PNGs are used instead.
+
+BUNDLE_DATA = "assets.rgba"
+BUNDLE_INDEX = "assets.json"
+BUNDLE_VERSION = 1
+PADDING = 1  # empty pixels between images in the atlas
+
+_bundles = {}  # resource directory -> {file name: TextureRegion}, None if unusable
+
+
+def asset_file_names() -> list[str]:
+    """All images that go in the bundle"""
+    names = []
+    for color in COLORS:
+        names += [f"Block_{color}.png", f"Gem_{color}.png"]
+    return names + ["GameBoard.png", "None.png"]
+
+
+def _asset_info(name: str, width: int, height: int) -> dict:
+    """Anchors and color tag an image gets at runtime, same as GameAssets & GameBoard set"""
+    info = {"anchor_x": 0, "anchor_y": 0, "color": None}
+    if name.startswith(("Block_", "Gem_")):
+        # Anchor at bottom center so it's easy to align tiles to game board
+        info["anchor_x"] = width / 2
+        info["color"] = name.split("_", 1)[1][: -len(".png")]
+    elif name == "GameBoard.png":
+        info["anchor_x"] = width / 2
+        info["anchor_y"] = height / 2
+    return info
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def bake(resource_dir: str, atlas_width: int = 256) -> str:
+    """
+    Decode the game's PNGs and pack them into a raw RGBA atlas with an index
+
+    Args:
+        resource_dir (str): directory holding the PNGs, the bundle is written there too
+        atlas_width (int): width of the atlas in pixels, grown if an image is wider
+
+    Returns:
+        str: path of the written index
+    """
+    images = {}
+    for name in asset_file_names():
+        image = pyglet.image.load(os.path.join(resource_dir, name)).get_image_data()
+        pixels = np.frombuffer(image.get_data("RGBA", image.width * 4), dtype=np.uint8)
+        images[name] = pixels.reshape(image.height, image.width, 4)
+
+    # Shelf packing: tallest images first, left to right, rows from the bottom up
+    atlas_width = max([atlas_width] + [pixels.shape[1] for pixels in images.values()])
+    placements = {}
+    x, y, shelf_height = 0, 0, 0
+    for name in sorted(images, key=lambda name: -images[name].shape[0]):
+        height, width = images[name].shape[:2]
+        if x + width > atlas_width:
+            x, y, shelf_height = 0, y + shelf_height + PADDING, 0
+        placements[name] = (x, y)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+    atlas_height = y + shelf_height
+
+    # Rows are bottom to top, like pyglet image data
+    atlas = np.zeros((atlas_height, atlas_width, 4), dtype=np.uint8)
+    index = {
+        "version": BUNDLE_VERSION,
+        "width": atlas_width,
+        "height": atlas_height,
+        "images": {},
+    }
+    for name, (x, y) in placements.items():
+        height, width = images[name].shape[:2]
+        atlas[y : y + height, x : x + width] = images[name]
+        index["images"][name] = {
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "sha1": _file_hash(os.path.join(resource_dir, name)),
+            **_asset_info(name, width, height),
+        }
+
+    atlas.tofile(os.path.join(resource_dir, BUNDLE_DATA))
+    index_path = os.path.join(resource_dir, BUNDLE_INDEX)
+    with open(index_path, "w") as file:
+        json.dump(index, file, indent=1)
+    return index_path
+
+
+def read_bundle(resource_dir: str) -> dict | None:
+    """
+    Load a baked bundle as texture regions
+
+    Args:
+        resource_dir (str): directory holding the bundle
+
+    Returns:
+        dict | None: file name -> pyglet.image.TextureRegion, or None if the bundle
+            is missing, from another bundle version, or older than its PNGs
+    """
+    index_path = os.path.join(resource_dir, BUNDLE_INDEX)
+    data_path = os.path.join(resource_dir, BUNDLE_DATA)
+    if not (os.path.exists(index_path) and os.path.exists(data_path)):
+        return None
+    with open(index_path) as file:
+        index = json.load(file)
+    if index.get("version") != BUNDLE_VERSION or set(index["images"]) != set(
+        asset_file_names()
+    ):
+        return None
+    # Stale if any PNG that is still around changed since baking
+    for name, info in index["images"].items():
+        png_path = os.path.join(resource_dir, name)
+        if os.path.exists(png_path) and _file_hash(png_path) != info["sha1"]:
+            return None
+
+    pixels = np.memmap(data_path, dtype=np.uint8, mode="r")
+    if len(pixels) != index["width"] * index["height"] * 4:
+        return None
+    # Hand pyglet a pointer into the mapping, it uploads from there without a copy
+    texture = pyglet.image.ImageData(
+        index["width"],
+        index["height"],
+        "RGBA",
+        pixels.ctypes.data_as(ctypes.POINTER(ctypes.c_ubyte)),
+    ).get_texture()
+    regions = {}
+    for name, info in index["images"].items():
+        region = texture.get_region(info["x"], info["y"], info["width"], info["height"])
+        region.anchor_x = info["anchor_x"]
+        region.anchor_y = info["anchor_y"]
+        if info["color"] is not None:
+            region.color = info["color"]
+        regions[name] = region
+    return regions
+
+
+def _bundle_dir() -> str | None:
+    """Resource directory the bundle index is found in, if any"""
+    try:
+        location = pyglet.resource.location(BUNDLE_INDEX)
+    except pyglet.resource.ResourceNotFoundException:
+        return None
+    return getattr(location, "path", None)
+
+
+def image(name: str) -> pyglet.image.AbstractImage:
+    """
+    Get a game image from the bundle, falling back to pyglet.resource when it can't be used
+
+    Args:
+        name (str): PNG file name, e.g. "Block_Pink.png"
+
+    Returns:
+        pyglet.image.AbstractImage: the image
+    """
+    resource_dir = _bundle_dir()
+    if resource_dir is not None:
+        if resource_dir not in _bundles:
+            _bundles[resource_dir] = read_bundle(resource_dir)
+        bundle = _bundles[resource_dir]
+        if bundle is not None and name in bundle:
+            return bundle[name]
+    return pyglet.resource.image(name)
+
+
+if __name__ == "__main__":
+    # Bake step, e.g. from version1: python -m game.game_bundle ../resources
+    print(bake(sys.argv[1] if len(sys.argv) > 1 else "../resources"))
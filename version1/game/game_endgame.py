@@ -0,0 +1,398 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator
+import time
+
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE
+from game.game_rules import LINE_BONUS
+import game.game_ai
+import game.game_rules
+
+if TYPE_CHECKING:
+    import game.game_setup
+
+### Exact solver for the end of the game, once the bag can't refill the hand
+# The board is held as integer bitboards, bit index = x * tiles_per_row + y like the
+# flat cells of game_rules: one occupancy board plus one board per block color and
+# one per gem color. A tile's code sits where its block and gem boards overlap.
+# With no more draws the rest of the game only depends on the board and hand, so
+# it can be searched to the end: depth-first with alpha pruning against an upper
+# bound on the points left, best-scoring moves first and a bounded table of solved positions.
+
+EXACT = 0
+UPPER_BOUND = 1  # the position is worth at most the stored value
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class BitBoard:
+    """
+    Tiles on the board as bitboards
+    """
+
+    def __init__(self, tiles_per_row: int = 6):
+        self.tiles_per_row = tiles_per_row
+        self.occupied = 0
+        self.blocks = [0] * len(COLORS)
+        self.gems = [0] * len(COLORS)
+
+    @classmethod
+    def from_cells(cls, cells: list[int], tiles_per_row: int) -> BitBoard:
+        """Build from a flattened board of tile codes"""
+        bitboard = cls(tiles_per_row)
+        for cell, code in enumerate(cells):
+            if code != EMPTY_TILE:
+                bitboard.place(cell, code)
+        return bitboard
+
+    def place(self, cell: int, code: int):
+        bit = 1 << cell
+        block, gem = divmod(code, len(COLORS))
+        self.occupied |= bit
+        self.blocks[block] |= bit
+        self.gems[gem] |= bit
+
+    def remove(self, cell: int, code: int):
+        bit = ~(1 << cell)
+        block, gem = divmod(code, len(COLORS))
+        self.occupied &= bit
+        self.blocks[block] &= bit
+        self.gems[gem] &= bit
+
+    def code_at(self, cell: int) -> int:
+        bit = 1 << cell
+        if not self.occupied & bit:
+            return EMPTY_TILE
+        block = next(idx for idx, plane in enumerate(self.blocks) if plane & bit)
+        gem = next(idx for idx, plane in enumerate(self.gems) if plane & bit)
+        return block * len(COLORS) + gem
+
+    def key(self) -> tuple[int, ...]:
+        """Hashable description of the board, the occupancy follows from the block boards"""
+        return (*self.blocks, *self.gems)
+
+
+class EndgameResult:
+    """
+    Best sequence of moves found by the solver
+    """
+
+    def __init__(
+        self,
+        moves: list[tuple[tuple[int, int, int], ...]],
+        value: int,
+        complete: bool,
+        nodes: int,
+        elapsed: float,
+    ):
+        self.moves = moves  # one tuple of (x, y, tile code) placements per move
+        self.value = value  # points scored by playing all of moves
+        self.complete = complete  # False if the budget ran out first
+        self.nodes = nodes
+        self.elapsed = elapsed  # seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class EndgameSolver:
+    """
+    Finds the sequence of moves that scores the most points from the tiles in hand
+    when no more tiles will be drawn, within a node and time budget
+    """
+
+    def __init__(
+        self,
+        tiles_per_row: int = 6,
+        time_budget: float = 1.0,
+        max_nodes: int | None = None,
+        table_size: int = 2**18,
+    ):
+        self.tiles_per_row = tiles_per_row
+        self.time_budget = time_budget  # seconds per solve
+        self.max_nodes = max_nodes  # None for no limit
+        self.table = game.game_ai.TranspositionTable(table_size)
+        self.nodes = 0
+        self._deadline = 0.0
+        self._node_limit = 0
+
+        # Cells walked outward from each cell, per axis and direction
+        no_cells = tiles_per_row**2
+        self.rays = []
+        for cell in range(no_cells):
+            x, y = divmod(cell, tiles_per_row)
+            along_x = [pos * tiles_per_row + y for pos in range(tiles_per_row)]
+            along_y = [x * tiles_per_row + pos for pos in range(tiles_per_row)]
+            self.rays.append(
+                (
+                    (along_x[x - 1 :: -1] if x else [], along_x[x + 1 :]),
+                    (along_y[y - 1 :: -1] if y else [], along_y[y + 1 :]),
+                )
+            )
+        self.neighbours = [
+            sum(1 << ray[0] for rays in self.rays[cell] for ray in rays if ray)
+            for cell in range(no_cells)
+        ]
+        # Most points a single tile can add: a full line with bonus in both directions
+        self.max_tile_points = 2 * (len(COLORS) + LINE_BONUS)
+
+    def solve(
+        self,
+        board: np.ndarray,
+        hand: list[int],
+        time_budget: float | None = None,
+        max_nodes: int | None = None,
+    ) -> EndgameResult:
+        """
+        Search for the best sequence of moves until no tile in hand can be played
+
+        Args:
+            board (np.ndarray): tiles_per_row x tiles_per_row array of tile codes
+            hand (list[int]): tile codes in hand, none will be drawn anymore
+            time_budget (float | None): seconds to search, defaults to self.time_budget
+            max_nodes (int | None): positions to visit, defaults to self.max_nodes
+
+        Returns:
+            EndgameResult: optimal moves if complete, else the best found in the budget
+        """
+        start = time.perf_counter()
+        self._deadline = start + (
+            self.time_budget if time_budget is None else time_budget
+        )
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
+        self._node_limit = float("inf") if max_nodes is None else max_nodes
+        self.nodes = 0
+
+        bitboard = BitBoard.from_cells(board.ravel().tolist(), self.tiles_per_row)
+        hand = tuple(sorted(hand))
+
+        # Greedy play gives a first answer to beat, kept if time runs out before a better one
+        best_value, best_line = self._greedy(bitboard, hand)
+        complete = True
+        try:
+            for score, move in self._ordered_moves(bitboard, hand):
+                for cell, code in move:
+                    bitboard.place(cell, code)
+                try:
+                    value, line = self._solve(
+                        bitboard, self._remove(hand, move), best_value - score
+                    )
+                finally:
+                    for cell, code in move:
+                        bitboard.remove(cell, code)
+                if line is not None and score + value > best_value:
+                    best_value, best_line = score + value, [move] + line
+        except _SearchTimeout:
+            complete = False
+
+        return EndgameResult(
+            [
+                tuple((*divmod(cell, self.tiles_per_row), code) for cell, code in move)
+                for move in best_line
+            ],
+            best_value,
+            complete,
+            self.nodes,
+            time.perf_counter() - start,
+        )
+
+    def hint(
+        self, game_board: game.game_setup.GameBoard, time_budget: float | None = None
+    ) -> EndgameResult:
+        """Solve from the tiles currently on a game board and in the player's hand"""
+        board, hand = game.game_rules.state_from_game_board(game_board)
+        return self.solve(board, hand, time_budget)
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self._node_limit or time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+    def _greedy(self, bitboard: BitBoard, hand: tuple[int, ...]):
+        """Play the best scoring move until none is left"""
+        value, line = 0, []
+        while hand:
+            moves = self._ordered_moves(bitboard, hand)
+            if not moves:
+                break
+            score, move = moves[0]
+            for cell, code in move:
+                bitboard.place(cell, code)
+            hand = self._remove(hand, move)
+            value += score
+            line.append(move)
+        for move in line:
+            for cell, code in move:
+                bitboard.remove(cell, code)
+        return value, line
+
+    def _solve(self, bitboard: BitBoard, hand: tuple[int, ...], alpha: int):
+        """
+        Most points the hand can still score.
+        Exact if above alpha, otherwise only known to be at most alpha.
+
+        Returns:
+            tuple: value and the moves that score it (None unless exact)
+        """
+        if not hand:
+            return 0, []
+        self._tick()
+        # Can't beat alpha even if every tile left scored the most possible
+        no_free = self.tiles_per_row**2 - bitboard.occupied.bit_count()
+        if min(len(hand), no_free) * self.max_tile_points <= alpha:
+            return alpha, None
+        key = (*bitboard.key(), hand)
+        entry = self.table.get(key)
+        if entry is not None:
+            flag, value, line = entry
+            if flag == EXACT or value <= alpha:
+                return value, line
+
+        best_value, best_line = 0, []
+        for score, move in self._ordered_moves(bitboard, hand):
+            for cell, code in move:
+                bitboard.place(cell, code)
+            try:
+                value, line = self._solve(
+                    bitboard,
+                    self._remove(hand, move),
+                    max(alpha, best_value) - score,
+                )
+            finally:
+                for cell, code in move:
+                    bitboard.remove(cell, code)
+            if line is not None and score + value > best_value:
+                best_value, best_line = score + value, [move] + line
+
+        if best_value > alpha:
+            self.table.put(key, (EXACT, best_value, best_line))
+            return best_value, best_line
+        self.table.put(key, (UPPER_BOUND, alpha, None))
+        return alpha, None
+
+    def _ordered_moves(self, bitboard: BitBoard, hand: tuple[int, ...]):
+        """Legal moves with their scores, best scoring first"""
+        moves = [
+            (self._score(bitboard, move), move)
+            for move in self._iter_moves(bitboard, hand)
+        ]
+        moves.sort(key=lambda scored: scored[0], reverse=True)
+        return moves
+
+    @staticmethod
+    def _remove(hand: tuple[int, ...], move) -> tuple[int, ...]:
+        rest = list(hand)
+        for _, code in move:
+            rest.remove(code)
+        return tuple(rest)
+
+    # Bitboard versions of the game_rules checks
+
+    def _side(self, occupied: int, ray: list[int]) -> int:
+        """Bitboard of the tiles touching a cell along one ray"""
+        side = 0
+        for other in ray:
+            bit = 1 << other
+            if not occupied & bit:
+                break
+            side |= bit
+        return side
+
+    def _run(self, occupied: int, cell: int, axis: int) -> int:
+        """Bitboard of the tiles touching cell along axis, cell itself not included"""
+        before, after = self.rays[cell][axis]
+        return self._side(occupied, before) | self._side(occupied, after)
+
+    def _fits(self, bitboard: BitBoard, cell: int, code: int) -> bool:
+        """Checks both lines through cell if code were placed there"""
+        block, gem = divmod(code, len(COLORS))
+        blocks, gems = bitboard.blocks[block], bitboard.gems[gem]
+        for before, after in self.rays[cell]:
+            before = self._side(bitboard.occupied, before)
+            after = self._side(bitboard.occupied, after)
+            run = before | after
+            if not run:
+                continue
+            if run & blocks & gems or (run & ~blocks and run & ~gems):
+                # The same tile is already in the line, or nothing in common with it
+                return False
+            if before and after:
+                # Joining two runs, they mustn't hold the same tile. The line shares
+                # one color, so a repeat shows up in the planes of the other color.
+                planes = bitboard.gems if run & blocks == run else bitboard.blocks
+                if any(before & plane and after & plane for plane in planes):
+                    return False
+        return True
+
+    def _iter_moves(
+        self, bitboard: BitBoard, hand: tuple[int, ...]
+    ) -> Iterator[tuple[tuple[int, int], ...]]:
+        """
+        Every legal move once, as sorted (cell, tile code) placements.
+        Places tiles on bitboard while searching but leaves it as it was.
+        """
+        board_empty = bitboard.occupied == 0
+        occupied_before = bitboard.occupied
+        seen = set()
+
+        def extend(placed, rest, axis):
+            key = frozenset(placed)
+            if key in seen:
+                return
+            seen.add(key)
+            yield tuple(sorted(placed))
+            if not rest:
+                return
+            for line_axis in (0, 1) if axis is None else (axis,):
+                for ray in self.rays[placed[0][0]][line_axis]:
+                    # First free space past the end of the line
+                    cell = next(
+                        (other for other in ray if not bitboard.occupied & 1 << other),
+                        None,
+                    )
+                    if cell is None:
+                        continue
+                    for code in set(rest):
+                        if self._fits(bitboard, cell, code):
+                            remaining = list(rest)
+                            remaining.remove(code)
+                            bitboard.place(cell, code)
+                            yield from extend(
+                                placed + [(cell, code)], remaining, line_axis
+                            )
+                            bitboard.remove(cell, code)
+
+        # Every move after the first has a tile next to the board, so start from those spaces
+        for cell in range(self.tiles_per_row**2):
+            if occupied_before & 1 << cell or not (
+                board_empty or self.neighbours[cell] & occupied_before
+            ):
+                continue
+            for code in set(hand):
+                if self._fits(bitboard, cell, code):
+                    remaining = list(hand)
+                    remaining.remove(code)
+                    bitboard.place(cell, code)
+                    yield from extend([(cell, code)], remaining, None)
+                    bitboard.remove(cell, code)
+
+    def _score(self, bitboard: BitBoard, move: tuple[tuple[int, int], ...]) -> int:
+        """Points for a move, same as game_rules.score_cells"""
+        occupied = bitboard.occupied
+        for cell, _ in move:
+            occupied |= 1 << cell
+        lines = set()
+        score = 0
+        for cell, _ in move:
+            for axis in (0, 1):
+                run = self._run(occupied, cell, axis)
+                if run:
+                    line = (axis, run | 1 << cell)
+                    if line not in lines:
+                        lines.add(line)
+                        length = run.bit_count() + 1
+                        score += length + (LINE_BONUS if length == len(COLORS) else 0)
+        return score or 1
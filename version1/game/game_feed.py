@@ -0,0 +1,412 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import os
+import socket
+import struct
+import sys
+
+from game.game_utils import EMPTY_TILE, TileStatus, tile_code
+import game.game_rules
+
+if TYPE_CHECKING:
+    import game.game_setup
+
+### Live game state feed for spectators and recordings
+# After each move a game's state (board, hand and tiles left in the bag) is compared with
+# the last state sent, and only what changed is encoded. Every keyframe_interval messages
+# the full state is sent instead, so a subscriber that joined late or fell behind catches up.
+# A message is encoded once, and the same bytes are queued for every subscriber.
+#
+# Wire format, little endian. Every message is
+#   u16 length of the rest | u8 kind | u32 game id | u32 sequence | u16 bag count
+#   | u8 no. cells | u8 no. slots | no. cells x (u8 cell, u8 tile code)
+#   | no. slots x (u8 hand slot, u8 tile code)
+# Cells are flat board indices (x * tiles_per_row + y), tile code 255 means empty.
+# A keyframe lists every occupied cell and every hand slot, a delta only what changed.
+
+KEYFRAME = 0
+DELTA = 1
+HEADER = struct.Struct("<HBIIHBB")
+EMPTY_CODE = 255  # EMPTY_TILE on the wire
+
+
+def game_snapshot(
+    game_board: game.game_setup.GameBoard,
+    player_hand: game.game_setup.PlayerHand,
+    tile_pool: game.game_setup.TilePool,
+) -> tuple[list[int], list[int], int]:
+    """
+    Read the state a feed sends off of a running game
+
+    Args:
+        game_board (game.game_setup.GameBoard): board with the placed tile sprites
+        player_hand (game.game_setup.PlayerHand): the player's tiles, in slot order
+        tile_pool (game.game_setup.TilePool): the bag
+
+    Returns:
+        tuple[list[int], list[int], int]: flat board tile codes, tile code per hand slot
+            (EMPTY_TILE once the tile left the hand) and the number of tiles in the bag
+    """
+    board, _ = game.game_rules.state_from_game_board(game_board)
+    hand = [
+        tile_code(tile.block_color, tile.gem_color)
+        if tile.tile_status is TileStatus.Hand
+        else EMPTY_TILE
+        for tile in player_hand.player_hand
+    ]
+    hand += [EMPTY_TILE] * (player_hand.hand_size - len(hand))
+    return board.ravel().tolist(), hand, len(tile_pool.tiles)
+
+
+def _pairs(changes: list[tuple[int, int]]) -> bytes:
+    return bytes(
+        value for index, code in changes for value in (index, code & EMPTY_CODE)
+    )
+
+
+def encode(
+    kind: int,
+    game_id: int,
+    sequence: int,
+    bag_count: int,
+    cells: list[tuple[int, int]],
+    slots: list[tuple[int, int]],
+) -> bytes:
+    """
+    Build one message
+
+    Args:
+        kind (int): KEYFRAME or DELTA
+        game_id (int): game the message is about
+        sequence (int): message number within the game
+        bag_count (int): tiles left in the bag
+        cells (list[tuple[int, int]]): (flat cell, tile code) of board spaces
+        slots (list[tuple[int, int]]): (hand slot, tile code) of hand slots
+
+    Returns:
+        bytes: the framed message
+    """
+    body = _pairs(cells) + _pairs(slots)
+    return (
+        HEADER.pack(
+            HEADER.size - 2 + len(body),
+            kind,
+            game_id,
+            sequence & 0xFFFFFFFF,
+            bag_count,
+            len(cells),
+            len(slots),
+        )
+        + body
+    )
+
+
+def decode(message: bytes | memoryview) -> tuple:
+    """
+    Read a message built by encode
+
+    Returns:
+        tuple: kind, game id, sequence, bag count, (cell, tile code) list
+            and (hand slot, tile code) list, with EMPTY_TILE for empty
+    """
+    _, kind, game_id, sequence, bag_count, no_cells, no_slots = HEADER.unpack_from(
+        message
+    )
+    codes = [
+        EMPTY_TILE if code == EMPTY_CODE else code
+        for code in message[HEADER.size + 1 :: 2]
+    ]
+    indices = message[HEADER.size :: 2]
+    changes = list(zip(indices, codes))
+    return (
+        kind,
+        game_id,
+        sequence,
+        bag_count,
+        changes[:no_cells],
+        changes[no_cells : no_cells + no_slots],
+    )
+
+
+def split_messages(buffer: bytearray) -> list[bytes]:
+    """Take every complete message off the front of buffer, partial ones stay"""
+    messages = []
+    start = 0
+    while len(buffer) - start >= 2:
+        end = start + 2 + int.from_bytes(buffer[start : start + 2], "little")
+        if end > len(buffer):
+            break
+        messages.append(bytes(buffer[start:end]))
+        start = end
+    del buffer[:start]
+    return messages
+
+
+class FeedEncoder:
+    """
+    Turns one game's successive states into keyframes and deltas
+    """
+
+    def __init__(self, game_id: int, keyframe_interval: int = 60):
+        self.game_id = game_id
+        self.keyframe_interval = keyframe_interval  # messages between keyframes
+        self.sequence = 0  # number of the next message
+        self.cells = None  # last state sent
+        self.hand = None
+        self.bag_count = 0
+
+    def encode(self, cells: list[int], hand: list[int], bag_count: int) -> bytes | None:
+        """
+        Encode a new state of the game
+
+        Args:
+            cells (list[int]): flat board tile codes
+            hand (list[int]): tile code per hand slot
+            bag_count (int): tiles left in the bag
+
+        Returns:
+            bytes | None: a keyframe or delta, None if nothing changed since the last message
+        """
+        if self.cells is None or self.sequence % self.keyframe_interval == 0:
+            self.cells, self.hand, self.bag_count = list(cells), list(hand), bag_count
+            message = encode(
+                KEYFRAME,
+                self.game_id,
+                self.sequence,
+                bag_count,
+                [(cell, code) for cell, code in enumerate(cells) if code != EMPTY_TILE],
+                list(enumerate(hand)),
+            )
+            self.sequence += 1
+            return message
+        changed_cells = [
+            (cell, code)
+            for cell, (code, last) in enumerate(zip(cells, self.cells))
+            if code != last
+        ]
+        changed_slots = [
+            (slot, code)
+            for slot, (code, last) in enumerate(zip(hand, self.hand))
+            if code != last
+        ]
+        if not changed_cells and not changed_slots and bag_count == self.bag_count:
+            return None
+        for cell, code in changed_cells:
+            self.cells[cell] = code
+        for slot, code in changed_slots:
+            self.hand[slot] = code
+        self.bag_count = bag_count
+        message = encode(
+            DELTA,
+            self.game_id,
+            self.sequence,
+            bag_count,
+            changed_cells,
+            changed_slots,
+        )
+        self.sequence += 1
+        return message
+
+
+class GameView:
+    """
+    A subscriber's copy of one game
+    """
+
+    def __init__(self, tiles_per_row: int):
+        self.cells = [EMPTY_TILE] * tiles_per_row**2
+        self.hand = []
+        self.bag_count = 0
+        self.sequence = -1  # last message applied
+
+
+class FeedDecoder:
+    """
+    Rebuilds game states from a stream of messages.
+    Deltas are only applied on top of the message right before them, after a gap
+    a game waits for its next keyframe.
+    """
+
+    def __init__(self, tiles_per_row: int = 6):
+        self.tiles_per_row = tiles_per_row
+        self.games = {}  # game id -> GameView, only games in sync
+        self.buffer = bytearray()
+        self.skipped = 0  # deltas that couldn't be applied
+
+    def feed(self, data: bytes) -> set[int]:
+        """
+        Apply received bytes, which may end in the middle of a message
+
+        Returns:
+            set[int]: ids of the games that changed
+        """
+        self.buffer += data
+        changed = set()
+        for message in split_messages(self.buffer):
+            game_id = self.apply(message)
+            if game_id is not None:
+                changed.add(game_id)
+        return changed
+
+    def apply(self, message: bytes) -> int | None:
+        """Apply a single message, returns its game id or None if it was skipped"""
+        kind, game_id, sequence, bag_count, cells, slots = decode(message)
+        view = self.games.get(game_id)
+        if kind == KEYFRAME:
+            view = GameView(self.tiles_per_row)
+            view.hand = [EMPTY_TILE] * len(slots)
+            self.games[game_id] = view
+        elif view is None or sequence != (view.sequence + 1) & 0xFFFFFFFF:
+            # Missed a message, wait for the next keyframe
+            self.games.pop(game_id, None)
+            self.skipped += 1
+            return None
+        for cell, code in cells:
+            view.cells[cell] = code
+        for slot, code in slots:
+            view.hand[slot] = code
+        view.bag_count = bag_count
+        view.sequence = sequence
+        return game_id
+
+
+class _Subscriber:
+    """
+    Where a FeedHub sends, and the bytes it couldn't send yet
+    """
+
+    def __init__(self, stream: socket.socket | int):
+        self.stream = stream
+        if isinstance(stream, int):
+            # Write end of a pipe
+            os.set_blocking(stream, False)
+            self.send = lambda data: os.write(stream, data)
+        else:
+            stream.setblocking(False)
+            self.send = stream.send
+        self.pending = bytearray()
+
+    def close(self):
+        if isinstance(self.stream, int):
+            os.close(self.stream)
+        else:
+            self.stream.close()
+
+
+class FeedHub:
+    """
+    Fans messages out to subscribers over local sockets or pipes, without blocking.
+    Keeps each game's latest keyframe and the deltas after it, so new subscribers
+    start in sync. Subscribers that fall too far behind are dropped.
+    """
+
+    def __init__(self, max_backlog: int = 2**20):
+        self.max_backlog = max_backlog  # bytes queued per subscriber before dropping it
+        self.subscribers = []
+        self.catch_up = {}  # game id -> keyframe and deltas since, as bytes
+        self.listener = None
+        self.dropped = 0
+
+    def listen(self, path: str) -> socket.socket:
+        """Accept subscribers on a unix socket at path, new connections are taken in pump()"""
+        if os.path.exists(path):
+            os.remove(path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(path)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        return self.listener
+
+    def subscribe(self, stream: socket.socket | int):
+        """
+        Start sending to a connected socket or the write end of a pipe
+
+        Args:
+            stream (socket.socket | int): where to send messages
+        """
+        subscriber = _Subscriber(stream)
+        for messages in self.catch_up.values():
+            for message in messages:
+                subscriber.pending += message
+        self.subscribers.append(subscriber)
+
+    def publish(self, message: bytes | None):
+        """
+        Queue a message for every subscriber
+
+        Args:
+            message (bytes | None): from FeedEncoder.encode, None is ignored
+        """
+        if message is None:
+            return
+        _, kind, game_id = HEADER.unpack_from(message)[:3]
+        if kind == KEYFRAME:
+            self.catch_up[game_id] = [message]
+        elif game_id in self.catch_up:
+            self.catch_up[game_id].append(message)
+        for subscriber in self.subscribers:
+            subscriber.pending += message
+
+    def forget(self, game_id: int):
+        """Stop handing a finished game to new subscribers"""
+        self.catch_up.pop(game_id, None)
+
+    def pump(self, dt: float = 0.0):
+        """
+        Accept new subscribers and send as much as each one can take right now,
+        can be scheduled with pyglet.clock.schedule_interval
+        """
+        if self.listener is not None:
+            while True:
+                try:
+                    connection, _ = self.listener.accept()
+                except BlockingIOError:
+                    break
+                self.subscribe(connection)
+
+        still_subscribed = []
+        for subscriber in self.subscribers:
+            try:
+                while subscriber.pending:
+                    sent = subscriber.send(subscriber.pending)
+                    del subscriber.pending[:sent]
+            except BlockingIOError:
+                pass
+            except OSError:
+                # Subscriber went away
+                subscriber.pending.clear()
+                subscriber.close()
+                continue
+            if len(subscriber.pending) > self.max_backlog:
+                subscriber.close()
+                self.dropped += 1
+                continue
+            still_subscribed.append(subscriber)
+        self.subscribers = still_subscribed
+
+    def close(self):
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers = []
+        if self.listener is not None:
+            path = self.listener.getsockname()
+            self.listener.close()
+            self.listener = None
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    # Follow a game started with UNTILETLED_FEED set, e.g. from version1:
+    # python -m game.game_feed /tmp/untiletled.sock
+    decoder = FeedDecoder()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(sys.argv[1])
+        while data := connection.recv(4096):
+            for game_id in sorted(decoder.feed(data)):
+                view = decoder.games[game_id]
+                placed = sum(code != EMPTY_TILE for code in view.cells)
+                print(
+                    f"game {game_id} #{view.sequence}: {placed} tiles placed, "
+                    f"hand {view.hand}, {view.bag_count} in the bag"
+                )
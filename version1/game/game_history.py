@@ -0,0 +1,128 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections import deque
+
+from game.game_utils import TileStatus
+
+if TYPE_CHECKING:
+    import game.game_setup
+    import game.game_animation
+
+### Undo & redo of tile moves
+# Each move is stored as a small delta (one tile, its state before and after),
+# so undoing or redoing a move only touches that tile's sprites.
+
+
+def tile_state(
+    game_piece: game.game_setup.GamePieceSprite,
+    tweens: game.game_animation.TweenEngine | None = None,
+) -> tuple:
+    """
+    Snapshot of everything a move can change about a tile
+
+    Args:
+        game_piece (game.game_setup.GamePieceSprite): tile to describe
+        tweens (game.game_animation.TweenEngine | None): if given and the tile is
+            moving, describe it where its tween ends
+
+    Returns:
+        tuple: tile status, board coord, x, y, scale and block draw group
+    """
+    end = None if tweens is None else tweens.target(game_piece)
+    x, y, scale = (game_piece.x, game_piece.y, game_piece.scale) if end is None else end
+    return (
+        game_piece.tile_status,
+        game_piece.board_coord,
+        x,
+        y,
+        scale,
+        game_piece.block.group,
+    )
+
+
+def set_tile_state(game_piece: game.game_setup.GamePieceSprite, state: tuple):
+    """Put a tile back into a state taken with tile_state"""
+    tile_status, board_coord, x, y, scale, group = state
+    game_piece.tile_status = tile_status
+    game_piece.game_piece_info.tile_status = (
+        TileStatus.BoardPlaced
+        if tile_status is TileStatus.BoardPlaced
+        else TileStatus.Hand
+    )
+    game_piece.board_coord = board_coord
+    game_piece.block.group = group
+    game_piece.update(x=x, y=y, scale=scale)
+
+
+class TileDelta:
+    """
+    One tile move, reversible
+    """
+
+    def __init__(
+        self, game_piece: game.game_setup.GamePieceSprite, before: tuple, after: tuple
+    ):
+        self.game_piece = game_piece
+        self.before = before
+        self.after = after
+
+    def undo(self):
+        set_tile_state(self.game_piece, self.before)
+
+    def redo(self):
+        set_tile_state(self.game_piece, self.after)
+
+
+class MoveHistory:
+    """
+    Bounded undo/redo stacks of tile moves, oldest moves are forgotten first
+    """
+
+    def __init__(self, max_moves: int = 256):
+        self.undo_stack = deque(maxlen=max_moves)
+        self.redo_stack = []
+
+    def record(
+        self,
+        game_piece: game.game_setup.GamePieceSprite,
+        before: tuple,
+        after: tuple | None = None,
+    ):
+        """
+        Record a move that just happened
+
+        Args:
+            game_piece (game.game_setup.GamePieceSprite): tile that moved
+            before (tuple): tile_state of the tile before it moved
+            after (tuple | None): tile_state after the move, defaults to the tile's
+                current state
+        """
+        if after is None:
+            after = tile_state(game_piece)
+        self.undo_stack.append(TileDelta(game_piece, before, after))
+        # A new move makes the undone moves unreachable
+        self.redo_stack.clear()
+
+    def can_undo(self) -> bool:
+        return len(self.undo_stack) > 0
+
+    def can_redo(self) -> bool:
+        return len(self.redo_stack) > 0
+
+    def undo(self) -> TileDelta | None:
+        """Revert the latest move, returns it (None if there is nothing to undo)"""
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        delta.undo()
+        self.redo_stack.append(delta)
+        return delta
+
+    def redo(self) -> TileDelta | None:
+        """Play the latest undone move again, returns it (None if there is nothing to redo)"""
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        delta.redo()
+        self.undo_stack.append(delta)
+        return delta
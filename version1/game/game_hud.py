@@ -0,0 +1,69 @@
+import pyglet
+
+### Heads up display: text labels drawn as part of the game board's batch
+
+
+class Hud:
+    """
+    Labels that live in the main batch under their own ordered group, so the whole
+    HUD is drawn with the batch instead of one draw call per label.
+    Labels are only laid out again when their text or position actually changes.
+    """
+
+    def __init__(self, batch: pyglet.graphics.Batch, draw_group: int = -1):
+        self.batch = batch
+        # Draw under the game board, like labels drawn before the batch used to
+        self.group = pyglet.graphics.OrderedGroup(draw_group)
+        self.labels = {}
+
+    def add_label(self, name: str, text: str = "", **label_kwargs) -> pyglet.text.Label:
+        """
+        Create a label in the HUD
+
+        Args:
+            name (str): key used to update the label later
+            text (str): initial text
+            **label_kwargs: anything else pyglet.text.Label accepts (font, position, anchors...)
+
+        Returns:
+            pyglet.text.Label: the new label
+        """
+        label = pyglet.text.Label(
+            text=text, batch=self.batch, group=self.group, **label_kwargs
+        )
+        self.labels[name] = label
+        return label
+
+    def set_text(self, name: str, text: str) -> bool:
+        """
+        Change a label's text, returns True only if it changed (and was laid out again)
+        """
+        label = self.labels[name]
+        if label.text == text:
+            return False
+        label.text = text
+        return True
+
+    def update_label(self, name: str, **properties) -> bool:
+        """
+        Change several label properties (text, x, y, color...) with a single relayout
+
+        Returns:
+            bool: True if anything changed
+        """
+        label = self.labels[name]
+        changed = {
+            key: value
+            for key, value in properties.items()
+            if getattr(label, key) != value
+        }
+        if not changed:
+            return False
+        label.begin_update()
+        for key, value in changed.items():
+            setattr(label, key, value)
+        label.end_update()
+        return True
+
+    def remove_label(self, name: str):
+        self.labels.pop(name).delete()
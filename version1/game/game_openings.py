@@ -0,0 +1,281 @@
+from __future__ import annotations
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE
+import game.game_endgame
+import game.game_rules
+
+### Opening moves looked up in a precomputed table instead of searched
+# On the empty board a hand's moves and scores only depend on which of its tiles share
+# colors, not on the colors themselves: renaming block colors, renaming gem colors or
+# swapping blocks with gems gives a hand that plays the same. canonical_hand() picks one
+# hand out of each such class, so there are only a few hundred classes of opening hands.
+# build_table() solves every class once, offline, with the endgame solver and writes a
+# hashed table to OPENINGS_FILE. OpeningTable memory maps it, a lookup is one or two probes.
+
+OPENINGS_FILE = "openings.npy"
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "resources", OPENINGS_FILE
+)
+MAX_HAND_SIZE = 10  # tiles per key, 6 bits each
+ENTRY = np.dtype(
+    [
+        ("key", "<u8"),  # packed canonical hand, 0 for an empty slot
+        ("value", "u1"),  # points from the opening and the moves after it
+        ("score", "u1"),  # points from the opening alone
+        ("depth", "u1"),  # number of moves in the solved line
+        ("complete", "u1"),  # 0 if the solver ran out of time on this hand
+        ("no_tiles", "u1"),  # tiles in the opening
+        ("cells", "u1", (MAX_HAND_SIZE,)),  # flat cells of the opening's tiles
+        ("codes", "u1", (MAX_HAND_SIZE,)),  # their canonical tile codes
+    ]
+)
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing
+
+
+def canonical_hand(hand: list[int]) -> tuple[tuple[int, ...], dict[int, int]]:
+    """
+    The hand every recoloring of this hand maps to
+
+    Args:
+        hand (list[int]): tile codes
+
+    Returns:
+        tuple[tuple[int, ...], dict[int, int]]: sorted canonical tile codes, and the
+            tile code in hand of each canonical tile code
+    """
+    no_colors = len(COLORS)
+    best, best_mapping = None, None
+    for swap in (False, True):
+        tiles = [divmod(code, no_colors)[:: -1 if swap else 1] for code in hand]
+        # Only block colors that can't be told apart need to be tried in every order
+        gem_counts = {}
+        for _, gem in tiles:
+            gem_counts[gem] = gem_counts.get(gem, 0) + 1
+        groups = {}
+        for block in sorted({block for block, _ in tiles}):
+            signature = tuple(
+                sorted(
+                    (tiles.count((block, gem)), gem_counts[gem])
+                    for gem in {gem for other, gem in tiles if other == block}
+                )
+            )
+            groups.setdefault(signature, []).append(block)
+        for orders in itertools.product(
+            *(itertools.permutations(groups[signature]) for signature in sorted(groups))
+        ):
+            block_rank = {
+                block: rank
+                for rank, block in enumerate(
+                    block for order in orders for block in order
+                )
+            }
+            # With the blocks ordered, gems are ordered by which blocks they sit on
+            gem_blocks = {gem: [0] * len(block_rank) for gem in gem_counts}
+            for block, gem in tiles:
+                gem_blocks[gem][block_rank[block]] += 1
+            gem_rank = {
+                gem: rank
+                for rank, gem in enumerate(
+                    sorted(gem_blocks, key=lambda gem: gem_blocks[gem], reverse=True)
+                )
+            }
+            mapping = {
+                block_rank[block] * no_colors + gem_rank[gem]: code
+                for (block, gem), code in zip(tiles, hand)
+            }
+            form = tuple(
+                sorted(
+                    block_rank[block] * no_colors + gem_rank[gem]
+                    for block, gem in tiles
+                )
+            )
+            if best is None or form < best:
+                best, best_mapping = form, mapping
+    return best, best_mapping
+
+
+def canonical_hands(hand_size: int = 6, no_sets: int = 3) -> list[tuple[int, ...]]:
+    """
+    Every class of hands, as canonical hands
+
+    Args:
+        hand_size (int): tiles in a hand
+        no_sets (int): copies of each tile in the bag
+
+    Returns:
+        list[tuple[int, ...]]: sorted canonical hands
+    """
+    no_colors = len(COLORS)
+    hands = set()
+
+    def extend(hand, no_blocks, no_gems):
+        if len(hand) == hand_size:
+            hands.add(canonical_hand(hand)[0])
+            return
+        # Colors are introduced in order, any hand can be recolored to such a hand
+        for block in range(min(no_blocks + 1, no_colors)):
+            for gem in range(min(no_gems + 1, no_colors)):
+                code = block * no_colors + gem
+                if hand.count(code) < no_sets:
+                    extend(
+                        hand + [code], max(no_blocks, block + 1), max(no_gems, gem + 1)
+                    )
+
+    extend([], 0, 0)
+    return sorted(hands)
+
+
+def hand_key(canonical: tuple[int, ...]) -> int:
+    """Pack a canonical hand into a non-zero integer"""
+    key = 0
+    for code in canonical:
+        key = key << 6 | (code + 1)
+    return key
+
+
+def _slot(key: int, capacity: int) -> int:
+    """First slot to probe for key in a table of capacity (a power of two) slots"""
+    bits = capacity.bit_length() - 1
+    return ((key * _HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+class Opening:
+    """
+    Best opening move for a hand, in the hand's own tile codes
+    """
+
+    def __init__(
+        self,
+        move: tuple[tuple[int, int, int], ...],
+        score: int,
+        value: int,
+        depth: int,
+        complete: bool,
+    ):
+        self.move = move  # (x, y, tile code) placements
+        self.score = score  # points the move earns right away
+        self.value = value  # points including the moves after it, without refills
+        self.depth = depth  # number of moves in the solved line
+        self.complete = complete  # False if value is only the best found, not proven
+
+
+def build_table(
+    path: str = DEFAULT_PATH,
+    hand_size: int = 6,
+    no_sets: int = 3,
+    tiles_per_row: int = 6,
+    time_budget: float = 10.0,
+    verbose: bool = False,
+) -> np.ndarray:
+    """
+    Solve every class of opening hands and write the table
+
+    Args:
+        path (str): .npy file to write
+        hand_size (int): tiles in an opening hand
+        no_sets (int): copies of each tile in the bag
+        tiles_per_row (int): board width
+        time_budget (float): seconds the solver gets per hand
+        verbose (bool): print progress
+
+    Returns:
+        np.ndarray: the table as written
+    """
+    if hand_size > MAX_HAND_SIZE:
+        raise ValueError(f"Hands of more than {MAX_HAND_SIZE} tiles can't be keyed")
+    hands = canonical_hands(hand_size, no_sets)
+    capacity = 1 << (2 * len(hands) - 1).bit_length()  # at most half full
+    table = np.zeros(capacity, dtype=ENTRY)
+    solver = game.game_endgame.EndgameSolver(tiles_per_row, time_budget=time_budget)
+    board = np.full((tiles_per_row, tiles_per_row), EMPTY_TILE, dtype=np.int8)
+    start = time.perf_counter()
+    for idx, hand in enumerate(hands):
+        result = solver.solve(board, list(hand))
+        key = hand_key(hand)
+        slot = _slot(key, capacity)
+        while table[slot]["key"]:
+            slot = (slot + 1) % capacity
+        entry = table[slot]
+        entry["key"] = key
+        entry["value"] = result.value
+        entry["depth"] = len(result.moves)
+        entry["complete"] = result.complete
+        if result.moves:
+            move = result.moves[0]
+            entry["score"] = game.game_rules.score_move(board, move)
+            entry["no_tiles"] = len(move)
+            entry["cells"][: len(move)] = [x * tiles_per_row + y for x, y, _ in move]
+            entry["codes"][: len(move)] = [code for _, _, code in move]
+        if verbose:
+            print(
+                f"{idx + 1}/{len(hands)} {hand}: {result.value} points"
+                f"{'' if result.complete else ' (budget ran out)'}"
+                f" {time.perf_counter() - start:.0f} s"
+            )
+    np.save(path, table)
+    return table
+
+
+class OpeningTable:
+    """
+    Memory mapped table written by build_table
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, tiles_per_row: int = 6):
+        self.table = np.load(path, mmap_mode="r")
+        self.capacity = len(self.table)
+        self.tiles_per_row = tiles_per_row
+
+    def lookup(self, hand: list[int]) -> Opening | None:
+        """
+        Best opening move for a hand
+
+        Args:
+            hand (list[int]): tile codes in hand
+
+        Returns:
+            Opening | None: the opening, None if the table holds no hand like it
+        """
+        if not hand or len(hand) > MAX_HAND_SIZE:
+            return None
+        canonical, mapping = canonical_hand(hand)
+        key = hand_key(canonical)
+        slot = _slot(key, self.capacity)
+        while True:
+            entry = self.table[slot]
+            if entry["key"] == key:
+                break
+            if entry["key"] == 0:
+                return None
+            slot = (slot + 1) % self.capacity
+        no_tiles = int(entry["no_tiles"])
+        move = tuple(
+            (*divmod(int(cell), self.tiles_per_row), mapping[int(code)])
+            for cell, code in zip(entry["cells"][:no_tiles], entry["codes"][:no_tiles])
+        )
+        return Opening(
+            move,
+            int(entry["score"]),
+            int(entry["value"]),
+            int(entry["depth"]),
+            bool(entry["complete"]),
+        )
+
+
+def load_table(path: str = DEFAULT_PATH) -> OpeningTable | None:
+    """The table at path, None if it hasn't been built"""
+    return OpeningTable(path) if os.path.exists(path) else None
+
+
+if __name__ == "__main__":
+    # Offline precomputation, e.g. from version1: python -m game.game_openings
+    build_table(
+        sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH,
+        time_budget=float(sys.argv[2]) if len(sys.argv) > 2 else 10.0,
+        verbose=True,
+    )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections import defaultdict
+
+if TYPE_CHECKING:
+    import game.game_setup
+
+### Finds which tile is under the mouse without checking every tile
+
+
+class TilePicker:
+    """
+    Uniform grid over the window, each grid cell lists the tiles whose bounding box overlaps it.
+    Tiles keep their entry up to date through update_game_piece.
+    """
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self.grid = defaultdict(set)  # (column, row) -> tiles overlapping that cell
+        self.tile_cells = {}  # tile -> grid cells it is listed in
+        self.insert_order = {}  # tile -> order added, later tiles are drawn on top
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self.tile_cells)
+
+    @staticmethod
+    def bounds(
+        game_piece: game.game_setup.GamePieceSprite,
+    ) -> tuple[float, float, float, float]:
+        """Left, bottom, right, top of a tile, same box as click_tile_make_active uses"""
+        # have to use block width bc parent sprite is 1x1
+        half_width = game_piece.block.width / 2
+        return (
+            game_piece.x - half_width,
+            game_piece.y,
+            game_piece.x + half_width,
+            game_piece.y + game_piece.block.height,
+        )
+
+    def add(self, game_piece: game.game_setup.GamePieceSprite):
+        """Start tracking a tile"""
+        self.insert_order[game_piece] = self._next_order
+        self._next_order += 1
+        self.tile_cells[game_piece] = []
+        game_piece.tile_picker = self
+        self.move(game_piece)
+
+    def remove(self, game_piece: game.game_setup.GamePieceSprite):
+        """Stop tracking a tile"""
+        for cell in self.tile_cells.pop(game_piece):
+            self.grid[cell].discard(game_piece)
+        del self.insert_order[game_piece]
+        game_piece.tile_picker = None
+
+    def move(self, game_piece: game.game_setup.GamePieceSprite):
+        """Re-file a tile after its position or scale changed"""
+        left, bottom, right, top = self.bounds(game_piece)
+        cells = [
+            (column, row)
+            for column in range(
+                int(left // self.cell_size), int(right // self.cell_size) + 1
+            )
+            for row in range(
+                int(bottom // self.cell_size), int(top // self.cell_size) + 1
+            )
+        ]
+        old_cells = self.tile_cells[game_piece]
+        if cells == old_cells:
+            return
+        for cell in old_cells:
+            self.grid[cell].discard(game_piece)
+        for cell in cells:
+            self.grid[cell].add(game_piece)
+        self.tile_cells[game_piece] = cells
+
+    def pick(self, x: float, y: float) -> game.game_setup.GamePieceSprite | None:
+        """
+        Find the topmost tile under a point
+
+        Args:
+            x (float): mouse x coord
+            y (float): mouse y coord
+
+        Returns:
+            game.game_setup.GamePieceSprite | None: tile drawn on top at that point, if any
+        """
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        topmost, topmost_key = None, None
+        for game_piece in self.grid.get(cell, ()):
+            left, bottom, right, top = self.bounds(game_piece)
+            if left < x < right and bottom < y < top:
+                key = (game_piece.block.group.order, self.insert_order[game_piece])
+                if topmost_key is None or key > topmost_key:
+                    topmost, topmost_key = game_piece, key
+        return topmost
@@ -0,0 +1,257 @@
+from __future__ import annotations
+import functools
+import json
+import random
+import socket
+import time
+import tracemalloc
+
+import numpy as np
+import game.game_actions
+
+### Opt-in instrumentation of game actions and GameBoard event handlers
+# enable() swaps the functions for timed wrappers, disable() puts the originals back,
+# so while profiling is off the game runs the original, unwrapped functions.
+# Call enable() before GameBoard.add_event_handlers(), pyglet keeps the handlers it was given.
+
+ACTION_FUNCTIONS = [
+    "is_board_space_selected",
+    "snap_tile_to_board_space",
+    "click_tile_make_active",
+    "deactivate_tiles",
+    "update_game_piece",
+]
+BOARD_HANDLERS = [
+    "on_mouse_press",
+    "on_mouse_drag",
+    "on_mouse_release",
+    "on_key_press",
+    "update",
+]
+
+_originals = {}  # (owner, attribute name) -> unwrapped function
+_sink = None
+_started_tracemalloc = False
+
+
+class CallStats:
+    """
+    Running totals for one instrumented function.
+    Latencies are kept in a reservoir sample so memory stays bounded on long runs.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.count = 0
+        self.total = 0.0  # seconds
+        self.allocated = 0  # net bytes allocated, if tracked
+        self.max_samples = max_samples
+        self.samples = []
+
+    def add(self, seconds: float, allocated: int | None):
+        self.count += 1
+        self.total += seconds
+        if allocated is not None:
+            self.allocated += allocated
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+        else:
+            idx = random.randrange(self.count)
+            if idx < self.max_samples:
+                self.samples[idx] = seconds
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.samples, q)) if self.samples else 0.0
+
+
+class MemorySink:
+    """
+    Keeps metrics in memory, use summary() to read them
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self.stats = {}
+
+    def record(self, name: str, seconds: float, allocated: int | None):
+        if name not in self.stats:
+            self.stats[name] = CallStats(self.max_samples)
+        self.stats[name].add(seconds, allocated)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Returns:
+            dict[str, dict[str, float]]: per function call count, total/mean/p50/p90/p99
+                latency in seconds and net bytes allocated
+        """
+        return {
+            name: {
+                "count": stats.count,
+                "total": stats.total,
+                "mean": stats.total / stats.count,
+                "p50": stats.percentile(50),
+                "p90": stats.percentile(90),
+                "p99": stats.percentile(99),
+                "allocated": stats.allocated,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """
+    Appends one JSON object per call to a file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "a")
+
+    def record(self, name: str, seconds: float, allocated: int | None):
+        self.file.write(
+            json.dumps(
+                {
+                    "time": time.time(),
+                    "name": name,
+                    "seconds": seconds,
+                    "allocated": allocated,
+                }
+            )
+            + "\n"
+        )
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class StatsdSink:
+    """
+    Sends StatsD style timings (and allocation gauges) over UDP, several metrics per packet
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "untiletled",
+        max_packet: int = 512,
+    ):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.max_packet = max_packet
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.buffer = []
+        self.buffer_size = 0
+
+    def record(self, name: str, seconds: float, allocated: int | None):
+        self._add(f"{self.prefix}.{name}:{seconds * 1000:.4f}|ms")
+        if allocated is not None:
+            self._add(f"{self.prefix}.{name}.allocated:{allocated}|g")
+
+    def _add(self, metric: str):
+        if self.buffer_size + len(metric) + 1 > self.max_packet:
+            self.flush()
+        self.buffer.append(metric)
+        self.buffer_size += len(metric) + 1
+
+    def flush(self):
+        if self.buffer:
+            self.socket.sendto("\n".join(self.buffer).encode(), self.address)
+            self.buffer = []
+            self.buffer_size = 0
+
+    def close(self):
+        self.flush()
+        self.socket.close()
+
+
+def _wrap(name: str, func, sink, trace_allocations: bool):
+    """Time (and optionally count allocations of) every call to func"""
+    perf_counter = time.perf_counter
+    if trace_allocations:
+        get_traced_memory = tracemalloc.get_traced_memory
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            before = get_traced_memory()[0]
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                sink.record(name, elapsed, get_traced_memory()[0] - before)
+
+    else:
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sink.record(name, perf_counter() - start, None)
+
+    return wrapper
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable(sink=None, trace_allocations: bool = False):
+    """
+    Start instrumenting game actions and GameBoard event handlers
+
+    Args:
+        sink (MemorySink | JsonLinesSink | StatsdSink | None): where metrics go,
+            a new MemorySink if None
+        trace_allocations (bool): also track net bytes allocated per call with tracemalloc
+
+    Returns:
+        the sink receiving metrics
+    """
+    global _sink, _started_tracemalloc
+    import game.game_setup
+
+    if is_enabled():
+        disable()
+    sink = MemorySink() if sink is None else sink
+    _sink = sink
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+
+    targets = [
+        (game.game_actions, name, f"game_actions.{name}") for name in ACTION_FUNCTIONS
+    ]
+    targets += [
+        (game.game_setup.GameBoard, name, f"GameBoard.{name}")
+        for name in BOARD_HANDLERS
+    ]
+    for owner, attribute, metric_name in targets:
+        original = owner.__dict__[attribute]
+        _originals[(owner, attribute)] = original
+        setattr(owner, attribute, _wrap(metric_name, original, sink, trace_allocations))
+    return sink
+
+
+def disable():
+    """Put the original functions back and flush the sink"""
+    global _sink, _started_tracemalloc
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+    if _sink is not None:
+        _sink.flush()
+        _sink = None
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
@@ -0,0 +1,229 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pyglet
+import game.game_setup
+
+### Record the window's input events and replay them headlessly
+# A recording is the random seed the game started with, every mouse/key event with a
+# timestamp, and the board's final state. Replaying rebuilds the game from the seed,
+# pushes the events through the same GameBoard, BoardSpace and GamePieceSprite
+# handlers as fast as possible, checks the final state and times every event.
+# A replay never opens a window, but the tile sprites still need an OpenGL context:
+# without a display, set PYGLET_HEADLESS=1 so pyglet makes one off screen.
+
+RECORDING_VERSION = 1
+RECORDED_EVENTS = [
+    "on_mouse_press",
+    "on_mouse_drag",
+    "on_mouse_release",
+    "on_key_press",
+]
+
+
+def game_state(game_board: game.game_setup.GameBoard) -> dict:
+    """
+    Describe tiles and board spaces in a form that can be saved and compared
+
+    Args:
+        game_board (game.game_setup.GameBoard): board to describe
+
+    Returns:
+        dict: per tile (block color, gem color, TileStatus name, board coord) in hand
+            order, and the SpaceStatus name of every board space
+    """
+    return {
+        "tiles": [
+            [
+                tile.block_color_str,
+                tile.gem_color_str,
+                tile.tile_status.name,
+                None if tile.board_coord is None else list(tile.board_coord),
+            ]
+            for tile in game_board.player_hand
+        ],
+        "spaces": [
+            [space.space_status.name for space in spaces_row]
+            for spaces_row in game_board.board_spaces
+        ],
+    }
+
+
+class InputRecorder:
+    """
+    Window event handler that records input events, push it onto the window last
+    so it sees every event before the game handles it
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.events = []
+        self.start = time.perf_counter()
+
+    def _record(self, event: str, *args):
+        self.events.append(
+            {"t": time.perf_counter() - self.start, "event": event, "args": list(args)}
+        )
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        self._record("on_mouse_press", x, y, button, modifiers)
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        self._record("on_mouse_drag", x, y, dx, dy, buttons, modifiers)
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        self._record("on_mouse_release", x, y, button, modifiers)
+
+    def on_key_press(self, symbol, modifiers):
+        self._record("on_key_press", symbol, modifiers)
+
+    def save(self, path: str, game_board: game.game_setup.GameBoard | None = None):
+        """
+        Write the recording as JSON
+
+        Args:
+            path (str): file to write
+            game_board (game.game_setup.GameBoard | None): if given, its current state
+                is saved as the state a replay has to end in
+        """
+        recording = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "events": self.events,
+            "final_state": None if game_board is None else game_state(game_board),
+        }
+        with open(path, "w") as file:
+            json.dump(recording, file)
+
+
+def load_recording(path: str) -> dict:
+    with open(path) as file:
+        recording = json.load(file)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version in {path}")
+    return recording
+
+
+class ReplayWindow(pyglet.event.EventDispatcher):
+    """
+    Stands in for the game window: same size and event stack, but never opened
+    """
+
+    def __init__(self, width: int = 800, height: int = 600):
+        self.width = width
+        self.height = height
+
+
+for event_type in RECORDED_EVENTS:
+    ReplayWindow.register_event_type(event_type)
+
+
+def new_game(
+    seed: int, game_window: pyglet.window.Window | ReplayWindow
+) -> game.game_setup.GameBoard:
+    """
+    Set a game up the same way unTILEtled.py does, with seeded tile draws
+
+    Args:
+        seed (int): seed for numpy's global random state, used to draw tiles
+        game_window (pyglet.window.Window | ReplayWindow): window to attach handlers to
+
+    Returns:
+        game.game_setup.GameBoard: board with a hand drawn and event handlers pushed
+    """
+    np.random.seed(seed)
+    game_board = game.game_setup.GameBoard(
+        game_window=game_window, player_hand=[], batch=pyglet.graphics.Batch()
+    )
+    game_tiles = game.game_setup.TilePool()
+    game_board.add_game_board_sprite()
+    game_board.define_board_spaces()
+    player_hand = game_tiles.pull_new_hand(game.game_setup.PlayerHand())
+    game_board = player_hand.build_hand_tiles_sprites(game_board)
+    game_board.add_event_handlers()
+    return game_board
+
+
+class ReplayResult:
+    """
+    Final state of a replay and how long each event took to handle
+    """
+
+    def __init__(self, game_board: game.game_setup.GameBoard, latencies: dict):
+        self.game_board = game_board
+        self.final_state = game_state(game_board)
+        self.latencies = latencies  # event name -> list of seconds
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Count and p50/p90/p99/max latency in seconds per event type"""
+        return {
+            event: {
+                "count": len(samples),
+                "p50": float(np.percentile(samples, 50)),
+                "p90": float(np.percentile(samples, 90)),
+                "p99": float(np.percentile(samples, 99)),
+                "max": max(samples),
+            }
+            for event, samples in self.latencies.items()
+        }
+
+    def assert_state(self, expected: dict):
+        """Raise AssertionError naming the first tile or space that differs"""
+        for idx, (got, want) in enumerate(
+            zip(self.final_state["tiles"], expected["tiles"])
+        ):
+            if got != want:
+                raise AssertionError(f"Tile {idx} ended as {got}, expected {want}")
+        if len(self.final_state["tiles"]) != len(expected["tiles"]):
+            raise AssertionError("Replay ended with a different number of tiles")
+        if self.final_state["spaces"] != expected["spaces"]:
+            raise AssertionError("Board space statuses differ from the recording")
+
+
+def replay(recording: dict, check_state: bool = True) -> ReplayResult:
+    """
+    Feed a recording through a fresh, headless game
+
+    Args:
+        recording (dict): recording from load_recording
+        check_state (bool): assert the recording's final state, if it has one
+
+    Returns:
+        ReplayResult: final state and per event latencies
+    """
+    game_board = new_game(recording["seed"], ReplayWindow())
+    dispatch_event = game_board.game_window.dispatch_event
+    perf_counter = time.perf_counter
+    latencies = {event: [] for event in RECORDED_EVENTS}
+    for event in recording["events"]:
+        start = perf_counter()
+        dispatch_event(event["event"], *event["args"])
+        latencies[event["event"]].append(perf_counter() - start)
+    result = ReplayResult(
+        game_board, {event: samples for event, samples in latencies.items() if samples}
+    )
+    if check_state and recording.get("final_state") is not None:
+        result.assert_state(recording["final_state"])
+    return result
+
+
+if __name__ == "__main__":
+    # e.g. from version1: python -m game.game_replay recording.json
+    # or PYGLET_HEADLESS=1 python -m game.game_replay recording.json without a display
+    # Resource paths are relative to the script, which is game/ when run with -m
+    pyglet.resource.path = [
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "..", "..", "resources"
+        )
+    ]
+    pyglet.resource.reindex()
+    result = replay(load_recording(sys.argv[1]))
+    print("Final state matches the recording")
+    for event, stats in result.summary().items():
+        print(
+            f"{event:<18} n={stats['count']:<6} p50={stats['p50'] * 1e6:8.1f} us"
+            f"  p99={stats['p99'] * 1e6:8.1f} us  max={stats['max'] * 1e6:8.1f} us"
+        )
@@ -0,0 +1,287 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE, TileStatus, tile_code
+
+if TYPE_CHECKING:
+    import game.game_setup
+
+### Rules of play, independent of pyglet so the AI and simulations can use them
+# A move places one or more tiles from hand into a single row or column of the board.
+# Every line of two or more touching tiles must share one attribute (all the same
+# block color or all the same gem color) and may not repeat a tile.
+# After the first move, every move has to touch a tile that is already on the board.
+# A move scores the length of every line it adds to, plus a bonus for each line
+# of len(COLORS) tiles it completes. A lone tile scores 1.
+
+LINE_BONUS = len(COLORS)
+
+# Boards are flattened to a list of tile codes, cell index = x * tiles_per_row + y,
+# which matches the [x, y] indexing of GameBoard.board_spaces
+
+
+def is_valid_line(codes: list[int]) -> bool:
+    """Determines if a line of touching tiles is allowed
+
+    Args:
+        codes (list[int]): tile codes of the line, in order
+
+    Returns:
+        bool: True if all tiles share a block or gem color and none repeat
+    """
+    if len(codes) < 2:
+        return True
+    if len(set(codes)) != len(codes):
+        return False
+    no_colors = len(COLORS)
+    return (
+        len({code // no_colors for code in codes}) == 1
+        or len({code % no_colors for code in codes}) == 1
+    )
+
+
+def run_bounds(
+    cells: list[int], tiles_per_row: int, cell: int, axis: int
+) -> tuple[int, int, int, int]:
+    """Finds the line of touching tiles through a cell
+
+    Args:
+        cells (list[int]): flattened board of tile codes
+        tiles_per_row (int): board width
+        cell (int): flat index of the cell to start from
+        axis (int): 0 to walk along x, 1 to walk along y
+
+    Returns:
+        tuple[int, int, int, int]: base, step, lo, hi, the line covers cells
+            base + pos * step for pos in lo..hi
+    """
+    step = tiles_per_row if axis == 0 else 1
+    pos = cell // tiles_per_row if axis == 0 else cell % tiles_per_row
+    base = cell - pos * step
+    lo = pos
+    while lo > 0 and cells[base + (lo - 1) * step] != EMPTY_TILE:
+        lo -= 1
+    hi = pos
+    while hi < tiles_per_row - 1 and cells[base + (hi + 1) * step] != EMPTY_TILE:
+        hi += 1
+    return base, step, lo, hi
+
+
+def cell_is_legal(cells: list[int], tiles_per_row: int, cell: int) -> bool:
+    """Checks both lines through a freshly placed tile"""
+    for axis in (0, 1):
+        base, step, lo, hi = run_bounds(cells, tiles_per_row, cell, axis)
+        if hi > lo and not is_valid_line(
+            [cells[base + pos * step] for pos in range(lo, hi + 1)]
+        ):
+            return False
+    return True
+
+
+def touches_board(
+    cells: list[int], tiles_per_row: int, placed_cells: list[int]
+) -> bool:
+    """Checks if any placed tile is next to a tile that was already on the board"""
+    placed = set(placed_cells)
+    for cell in placed_cells:
+        x, y = divmod(cell, tiles_per_row)
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < tiles_per_row and 0 <= ny < tiles_per_row:
+                neighbour = nx * tiles_per_row + ny
+                if neighbour not in placed and cells[neighbour] != EMPTY_TILE:
+                    return True
+    return False
+
+
+def score_cells(cells: list[int], tiles_per_row: int, placed_cells: list[int]) -> int:
+    """
+    Scores a move that has already been written into cells
+
+    Args:
+        cells (list[int]): flattened board including the placed tiles
+        tiles_per_row (int): board width
+        placed_cells (list[int]): flat indices of the tiles placed this move
+
+    Returns:
+        int: points earned by the move
+    """
+    lines = set()
+    score = 0
+    for cell in placed_cells:
+        for axis in (0, 1):
+            base, step, lo, hi = run_bounds(cells, tiles_per_row, cell, axis)
+            if hi > lo and (axis, base, lo) not in lines:
+                lines.add((axis, base, lo))
+                length = hi - lo + 1
+                score += length + (LINE_BONUS if length == len(COLORS) else 0)
+    return score or 1
+
+
+def iter_cell_moves(
+    cells: list[int], tiles_per_row: int, hand: list[int]
+) -> Iterator[tuple[tuple[int, int], ...]]:
+    """
+    Lazily enumerates every legal move, each move only once
+
+    Args:
+        cells (list[int]): flattened board of tile codes (not modified)
+        tiles_per_row (int): board width
+        hand (list[int]): tile codes in hand
+
+    Yields:
+        tuple[tuple[int, int], ...]: sorted (flat cell, tile code) placements
+    """
+    cells = list(cells)
+    board_empty = all(code == EMPTY_TILE for code in cells)
+    seen = set()
+
+    def extend(placed, rest, axis):
+        key = frozenset(placed)
+        if key in seen:
+            return
+        seen.add(key)
+        placed_cells = [cell for cell, _ in placed]
+        if board_empty or touches_board(cells, tiles_per_row, placed_cells):
+            yield tuple(sorted(placed))
+        if not rest:
+            return
+        # Grow the move at either end of its line, one row or column only
+        for line_axis in (0, 1) if axis is None else (axis,):
+            base, step, lo, hi = run_bounds(
+                cells, tiles_per_row, placed[0][0], line_axis
+            )
+            for pos in (lo - 1, hi + 1):
+                if not 0 <= pos < tiles_per_row:
+                    continue
+                cell = base + pos * step
+                for code in set(rest):
+                    cells[cell] = code
+                    if cell_is_legal(cells, tiles_per_row, cell):
+                        remaining = list(rest)
+                        remaining.remove(code)
+                        yield from extend(placed + [(cell, code)], remaining, line_axis)
+                    cells[cell] = EMPTY_TILE
+
+    # Every move after the first has a tile next to the board, so start from those spaces
+    starts = [
+        cell
+        for cell in range(len(cells))
+        if cells[cell] == EMPTY_TILE
+        and (board_empty or touches_board(cells, tiles_per_row, [cell]))
+    ]
+    for cell in starts:
+        for code in set(hand):
+            cells[cell] = code
+            if cell_is_legal(cells, tiles_per_row, cell):
+                remaining = list(hand)
+                remaining.remove(code)
+                yield from extend([(cell, code)], remaining, None)
+            cells[cell] = EMPTY_TILE
+
+
+def generate_moves(
+    board: np.ndarray, hand: list[int]
+) -> list[tuple[tuple[int, int, int], ...]]:
+    """
+    Lists every legal move for a hand
+
+    Args:
+        board (np.ndarray): tiles_per_row x tiles_per_row array of tile codes
+        hand (list[int]): tile codes in hand
+
+    Returns:
+        list[tuple[tuple[int, int, int], ...]]: moves as (x, y, tile code) placements
+    """
+    tiles_per_row = board.shape[0]
+    return [
+        tuple((*divmod(cell, tiles_per_row), code) for cell, code in move)
+        for move in iter_cell_moves(board.ravel().tolist(), tiles_per_row, hand)
+    ]
+
+
+def is_legal_move(
+    board: np.ndarray, hand: list[int], move: tuple[tuple[int, int, int], ...]
+) -> bool:
+    """Checks a single move without enumerating all of them"""
+    if not move:
+        return False
+    tiles_per_row = board.shape[0]
+    remaining = list(hand)
+    for _, _, code in move:
+        if code not in remaining:
+            return False
+        remaining.remove(code)
+    xs = {x for x, _, _ in move}
+    ys = {y for _, y, _ in move}
+    if len(xs) > 1 and len(ys) > 1:
+        return False
+    cells = board.ravel().tolist()
+    board_empty = all(code == EMPTY_TILE for code in cells)
+    placed_cells = []
+    for x, y, code in move:
+        cell = x * tiles_per_row + y
+        if cells[cell] != EMPTY_TILE:
+            return False
+        cells[cell] = code
+        placed_cells.append(cell)
+    for cell in placed_cells:
+        if not cell_is_legal(cells, tiles_per_row, cell):
+            return False
+    # All placed tiles have to end up in one unbroken line
+    axis = 0 if len(ys) == 1 else 1
+    base, step, lo, hi = run_bounds(cells, tiles_per_row, placed_cells[0], axis)
+    if not all(
+        cell in range(base + lo * step, base + hi * step + 1, step)
+        for cell in placed_cells
+    ):
+        return False
+    return board_empty or touches_board(cells, tiles_per_row, placed_cells)
+
+
+def score_move(board: np.ndarray, move: tuple[tuple[int, int, int], ...]) -> int:
+    """Scores a move against the board it will be played on"""
+    tiles_per_row = board.shape[0]
+    cells = board.ravel().tolist()
+    placed_cells = []
+    for x, y, code in move:
+        cells[x * tiles_per_row + y] = code
+        placed_cells.append(x * tiles_per_row + y)
+    return score_cells(cells, tiles_per_row, placed_cells)
+
+
+def apply_move(
+    board: np.ndarray, hand: list[int], move: tuple[tuple[int, int, int], ...]
+) -> tuple[np.ndarray, list[int]]:
+    """Returns copies of board and hand with the move played"""
+    board = board.copy()
+    hand = list(hand)
+    for x, y, code in move:
+        board[x, y] = code
+        hand.remove(code)
+    return board, hand
+
+
+def state_from_game_board(
+    game_board: game.game_setup.GameBoard,
+) -> tuple[np.ndarray, list[int]]:
+    """
+    Reads board and hand tile codes off of the sprites on a game board
+
+    Args:
+        game_board (game.game_setup.GameBoard): board holding the player's tiles
+
+    Returns:
+        tuple[np.ndarray, list[int]]: board tile codes and hand tile codes
+    """
+    board = np.full(
+        (game_board.tiles_per_row, game_board.tiles_per_row), EMPTY_TILE, dtype=np.int8
+    )
+    hand = []
+    for tile in game_board.player_hand:
+        code = tile_code(tile.block_color_str, tile.gem_color_str)
+        if tile.tile_status is TileStatus.BoardPlaced and tile.board_coord is not None:
+            board[tile.board_coord] = code
+        else:
+            hand.append(code)
+    return board, hand
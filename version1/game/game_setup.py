@@ -1,14 +1,30 @@
+from __future__ import annotations
 from curses.ascii import SP  # type: ignore
 import numpy as np
 import pyglet
-from game.game_utils import TileStatus, SpaceStatus
+from game.game_utils import TileStatus, SpaceStatus, COLORS
 import game.game_actions
+import game.game_history
+import game.game_hud
+import game.game_picking
+import game.game_animation
+import game.game_bundle
 
 
-COLORS = ["Pink", "Purple", "Indigo", "Blue", "Aqua", "Green"]
 pyglet.resource.path = ["../../resources"]
 pyglet.resource.reindex()
 
+_default_window = None  # shared by boards created without a window, opened on first use
+
+
+def default_window() -> pyglet.window.Window:
+    """The 800 x 600 window a GameBoard uses when it isn't given one"""
+    global _default_window
+    if _default_window is None:
+        _default_window = pyglet.window.Window(800, 600)
+    return _default_window
+
+
 # Load all block and gem images into a matrix of images 2 x 6 in size
 class GameAssets:
     def __init__(self):
@@ -19,9 +35,9 @@ class GameAssets:
             # Build File Names
             block_file_name = f"Block_{COLORS[color_idx]}.png"
             gem_file_name = f"Gem_{COLORS[color_idx]}.png"
-            # Inject into resources
-            block = pyglet.resource.image(block_file_name)
-            gem = pyglet.resource.image(gem_file_name)
+            # Inject into resources (pre-baked bundle if there is one, see game_bundle)
+            block = game.game_bundle.image(block_file_name)
+            gem = game.game_bundle.image(gem_file_name)
             # Set anchor to bottom center so that it's easy to align tiles to game board later
             block.anchor_x = block.width / 2
             gem.anchor_x = gem.width / 2
@@ -83,13 +99,14 @@ class GameBoard:
 
     def __init__(
         self,
-        game_window: pyglet.window.Window = pyglet.window.Window(800, 600),
+        game_window: pyglet.window.Window | None = None,
         player_hand: list = [],
         batch: pyglet.graphics.Batch = pyglet.graphics.Batch(),
         color: tuple = (9, 4, 10),
         tiles_per_row: int = 6,
     ):
-        self.game_window = game_window
+        # Only open a window if the board needs one, replays bring their own
+        self.game_window = default_window() if game_window is None else game_window
         self.batch = batch
         self.player_hand = player_hand
         self.color = color
@@ -97,13 +114,18 @@ class GameBoard:
         self.board_spaces: np.ndarray = np.empty(
             (self.tiles_per_row, self.tiles_per_row), dtype=object
         )  # No board spaced until drawn
+        self.history = game.game_history.MoveHistory()  # Undo/redo of tile moves
+        self.hud = game.game_hud.Hud(self.batch)  # Labels drawn with the board's batch
+        # Finds the tile under the mouse
+        self.tile_picker = game.game_picking.TilePicker()
+        self.tweens = game.game_animation.TweenEngine()  # Tiles moving smoothly
 
     def add_game_board_sprite(self, board_scale: float = 2):
         """
         Adds Game Board sprite to window
         """
         # Get Game Board Img
-        game_board_img = pyglet.resource.image("GameBoard.png")
+        game_board_img = game.game_bundle.image("GameBoard.png")
         # Place Anchor at image center
         game_board_img.anchor_x = game_board_img.width / 2
         game_board_img.anchor_y = game_board_img.height / 2
@@ -174,11 +196,23 @@ class GameBoard:
             for space in col:
                 self.game_window.push_handlers(space)
 
+    def on_mouse_press(self, x, y, button, modifier):
+        """
+        If a tile gets clicked, only the topmost tile under the mouse becomes active
+        """
+        tile = self.tile_picker.pick(x, y)
+        if tile is not None:
+            # The player's hand takes over from any animation, from where it was headed
+            self.tweens.finish(tile)
+            game.game_actions.click_tile_make_active(x, y, tile)
+
     def on_mouse_drag(self, x, y, dx, dy, button, modifiers):
         """
         Checks if player is dragging tile over board space and then snaps tile to spaces
         """
-        game.game_actions.snap_tile_to_board_space(self.player_hand, self.board_spaces)
+        game.game_actions.snap_tile_to_board_space(
+            self.player_hand, self.board_spaces, self.tweens
+        )
 
     def on_mouse_release(self, x, y, button, modifier):
         """
@@ -197,12 +231,35 @@ class GameBoard:
 
         for tile in self.player_hand:
             if tile.active:
-                game.game_actions.deactivate_tiles(tile, draw_group)
+                game.game_actions.deactivate_tiles(
+                    tile, draw_group, self.history, self.tweens
+                )
+
+    def on_key_press(self, symbol, modifiers):
+        """
+        Ctrl+Z undoes the last tile move, Ctrl+Y or Ctrl+Shift+Z redoes it
+        """
+        key = pyglet.window.key
+        if not modifiers & key.MOD_ACCEL:
+            return
+        # Don't rewind history under a tile that's being dragged
+        if any(tile.active for tile in self.player_hand):
+            return
+        if symbol == key.Y or (symbol == key.Z and modifiers & key.MOD_SHIFT):
+            delta = self.history.redo()
+        elif symbol == key.Z:
+            delta = self.history.undo()
+        else:
+            return
+        # The tile is put straight where the move left it, stop any animation
+        if delta is not None:
+            self.tweens.cancel(delta.game_piece)
 
     def update(self, dt):
         """
-        Runs all sprites update() function
+        Advances tile animations and runs all sprites update() function
         """
+        self.tweens.update(dt)
         objs = self.get_game_objects()
         for obj in objs:
             obj.update()
@@ -249,18 +306,16 @@ class GamePieceSprite(pyglet.sprite.Sprite):
             game_piece_info.gem, batch=batch, group=pyglet.graphics.OrderedGroup(50)
         )
         self.gem_color_str = game_piece_info.gem_color
+        self.game_piece_info = game_piece_info  # Tile this sprite was built from
 
         # Tile status
         self.active = active  # Is player holding tile right now
         self.tile_status = game_piece_info.tile_status  # Is tile in bag, hand, or board
+        self.board_coord = None  # (x, y) index of the board space the tile sits on
+        self.drag_origin = None  # tile state when it was picked up, for undo
+        self.tile_picker = None  # Set once the tile is added to a TilePicker
 
-        super().__init__(pyglet.resource.image("None.png"), batch=batch)
-
-    def on_mouse_press(self, x, y, button, modifier):
-        """
-        If a Tile gets clicked, define it as active
-        """
-        game.game_actions.click_tile_make_active(x, y, self)
+        super().__init__(game.game_bundle.image("None.png"), batch=batch)
 
     def on_mouse_drag(self, x, y, dx, dy, button, modifiers):
         """
@@ -329,6 +384,8 @@ class PlayerHand:
             tile.tile_status = TileStatus.Hand
             # Add both block and gem to sprite batch
             game_board.player_hand.append(game_piece_sprite)
+            # Make the tile clickable
+            game_board.tile_picker.add(game_piece_sprite)
         return game_board
 
 
@@ -366,13 +423,135 @@ class TilePool(GameAssets):
         """
         Draw an initial hand
         """
-        # Select six random tiles
-        player_hand.player_hand = list(
-            np.random.choice(self.tiles, player_hand.hand_size, replace=False)
-        )
-        # Remove those tiles from the bag & place in hand
-        for tile in player_hand.player_hand:
-            self.tiles.remove(tile)
-            tile.tile_status = TileStatus.Hand
+        # Select six random tiles, removing them from the bag & placing them in hand
+        player_hand.player_hand = self.draw(player_hand.hand_size)
 
         return player_hand
+
+    def draw(self, no_tiles: int) -> list[GamePiece]:
+        """
+        Draw random tiles out of the bag, takes time linear in the tiles drawn
+
+        Args:
+            no_tiles (int): how many tiles to draw, capped at the tiles left in the bag
+
+        Returns:
+            list[GamePiece]: drawn tiles, now with TileStatus.Hand
+        """
+        return TilePool.draw_batch([self], [no_tiles])[0]
+
+    def refill(self, player_hand: PlayerHand) -> PlayerHand:
+        """
+        Drop tiles that left the hand (e.g. placed on the board) and draw back up to hand size
+        """
+        return TilePool.refill_batch([self], [player_hand])[0]
+
+    def exchange(self, player_hand: PlayerHand, tiles: list[GamePiece]) -> PlayerHand:
+        """
+        Swap tiles from a hand for the same number of new tiles from the bag.
+        New tiles are drawn before the old ones go back, so they can't be drawn again.
+
+        Args:
+            player_hand (PlayerHand): hand giving up tiles
+            tiles (list[GamePiece]): tiles from that hand to put back in the bag
+
+        Returns:
+            PlayerHand: the same hand with the exchanged tiles replaced
+        """
+        return TilePool.exchange_batch([self], [player_hand], [tiles])[0]
+
+    @staticmethod
+    def draw_batch(pools: list[TilePool], counts: list[int]) -> list[list[GamePiece]]:
+        """
+        Draw tiles from many pools at once, one random number per tile drawn across all pools.
+        Each drawn tile is swapped to the end of its bag and popped, so no list.remove
+
+        Args:
+            pools (list[TilePool]): pools to draw from
+            counts (list[int]): how many tiles to draw from each pool
+
+        Returns:
+            list[list[GamePiece]]: tiles drawn from each pool
+        """
+        counts = [
+            max(0, min(count, len(pool.tiles))) for pool, count in zip(pools, counts)
+        ]
+        # The k-th tile drawn from a pool is picked from the len(pool.tiles) - k tiles left
+        bag_sizes = np.array(
+            [
+                len(pool.tiles) - k
+                for pool, count in zip(pools, counts)
+                for k in range(count)
+            ],
+            dtype=float,
+        )
+        picks = (
+            (np.random.random_sample(len(bag_sizes)) * bag_sizes).astype(int).tolist()
+        )
+
+        drawn = []
+        pick_idx = 0
+        for pool, count in zip(pools, counts):
+            tiles = pool.tiles
+            pool_drawn = []
+            for idx in picks[pick_idx : pick_idx + count]:
+                tiles[idx], tiles[-1] = tiles[-1], tiles[idx]
+                tile = tiles.pop()
+                tile.tile_status = TileStatus.Hand
+                pool_drawn.append(tile)
+            pick_idx += count
+            drawn.append(pool_drawn)
+        return drawn
+
+    @staticmethod
+    def refill_batch(
+        pools: list[TilePool], player_hands: list[PlayerHand]
+    ) -> list[PlayerHand]:
+        """
+        Refill a hand for every pool, see TilePool.refill
+        """
+        for player_hand in player_hands:
+            player_hand.player_hand = [
+                tile
+                for tile in player_hand.player_hand
+                if tile.tile_status is TileStatus.Hand
+            ]
+        drawn = TilePool.draw_batch(
+            pools,
+            [
+                player_hand.hand_size - len(player_hand.player_hand)
+                for player_hand in player_hands
+            ],
+        )
+        for player_hand, tiles in zip(player_hands, drawn):
+            player_hand.player_hand.extend(tiles)
+        return player_hands
+
+    @staticmethod
+    def exchange_batch(
+        pools: list[TilePool],
+        player_hands: list[PlayerHand],
+        tiles_to_exchange: list[list[GamePiece]],
+    ) -> list[PlayerHand]:
+        """
+        Exchange tiles for every pool, see TilePool.exchange
+        """
+        for pool, player_hand, tiles in zip(pools, player_hands, tiles_to_exchange):
+            hand_ids = {id(tile) for tile in player_hand.player_hand}
+            if len({id(tile) for tile in tiles} & hand_ids) != len(tiles):
+                raise ValueError("Only tiles in the player's hand can be exchanged")
+            if len(tiles) > len(pool.tiles):
+                raise ValueError("Not enough tiles left in the bag to exchange")
+
+        drawn = TilePool.draw_batch(pools, [len(tiles) for tiles in tiles_to_exchange])
+        for pool, player_hand, tiles, new_tiles in zip(
+            pools, player_hands, tiles_to_exchange, drawn
+        ):
+            returned_ids = {id(tile) for tile in tiles}
+            player_hand.player_hand = [
+                tile for tile in player_hand.player_hand if id(tile) not in returned_ids
+            ] + new_tiles
+            for tile in tiles:
+                tile.tile_status = TileStatus.Bag
+                pool.tiles.append(tile)
+        return player_hands
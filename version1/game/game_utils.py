@@ -1,6 +1,10 @@
 import enum
 
 
+COLORS = ["Pink", "Purple", "Indigo", "Blue", "Aqua", "Green"]
+EMPTY_TILE = -1  # Tile code of a board space with nothing on it
+
+
 class TileStatus(enum.Enum):
     Bag = 0
     Hand = 1
@@ -12,3 +16,21 @@ class SpaceStatus(enum.Enum):
     Free = 0
     Selected = 1
     Occupied = 2
+
+
+def tile_code(block_color: str, gem_color: str) -> int:
+    """Encodes a block/gem color pair as a single integer
+
+    Args:
+        block_color (str): color name of the block, one of COLORS
+        gem_color (str): color name of the gem, one of COLORS
+
+    Returns:
+        int: tile code, block index * len(COLORS) + gem index
+    """
+    return COLORS.index(block_color) * len(COLORS) + COLORS.index(gem_color)
+
+
+def tile_colors(code: int) -> tuple[int, int]:
+    """Decodes a tile code back into (block index, gem index)"""
+    return divmod(code, len(COLORS))
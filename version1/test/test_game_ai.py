@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+from game.game_utils import EMPTY_TILE, tile_code, tile_colors
+import game.game_rules
+import game.game_ai
+
+
+def empty_board(tiles_per_row: int = 6):
+    return np.full((tiles_per_row, tiles_per_row), EMPTY_TILE, dtype=np.int8)
+
+
+class TestGameRules(unittest.TestCase):
+    """
+    Unit tests for placement rules and scoring
+    """
+
+    def test_tile_code_round_trip(self):
+        code = tile_code("Indigo", "Green")
+        self.assertEqual(tile_colors(code), (2, 5))
+
+    def test_valid_lines(self):
+        pink_blocks = [tile_code("Pink", gem) for gem in ["Blue", "Aqua", "Green"]]
+        self.assertTrue(game.game_rules.is_valid_line(pink_blocks))
+        # Repeated tile
+        self.assertFalse(game.game_rules.is_valid_line(pink_blocks + pink_blocks[:1]))
+        # Nothing in common
+        self.assertFalse(
+            game.game_rules.is_valid_line(
+                [tile_code("Pink", "Blue"), tile_code("Aqua", "Green")]
+            )
+        )
+
+    def test_moves_share_an_attribute_and_a_line(self):
+        hand = [tile_code("Pink", "Blue"), tile_code("Pink", "Aqua")]
+        hand.append(tile_code("Green", "Green"))
+        moves = game.game_rules.generate_moves(empty_board(), hand)
+        self.assertTrue(moves)
+        for move in moves:
+            self.assertTrue(game.game_rules.is_legal_move(empty_board(), hand, move))
+            xs = {x for x, _, _ in move}
+            ys = {y for _, y, _ in move}
+            self.assertTrue(len(xs) == 1 or len(ys) == 1)
+        self.assertEqual(max(len(move) for move in moves), 2)
+
+    def test_moves_touch_board(self):
+        board = empty_board()
+        board[2, 2] = tile_code("Blue", "Blue")
+        moves = game.game_rules.generate_moves(board, [tile_code("Blue", "Pink")])
+        self.assertEqual(
+            sorted(move[0][:2] for move in moves), [(1, 2), (2, 1), (2, 3), (3, 2)]
+        )
+
+    def test_score_full_line_bonus(self):
+        board = empty_board()
+        for y in range(5):
+            board[0, y] = tile_code("Pink", game.game_utils.COLORS[y])
+        move = ((0, 5, tile_code("Pink", "Green")),)
+        self.assertEqual(
+            game.game_rules.score_move(board, move), 6 + game.game_rules.LINE_BONUS
+        )
+
+
+class TestGameAI(unittest.TestCase):
+    """
+    Unit tests for move search and its transposition table
+    """
+
+    def test_table_evicts_least_recently_used(self):
+        table = game.game_ai.TranspositionTable(capacity=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        table.get("a")
+        table.put("c", 3)
+        self.assertEqual(len(table), 2)
+        self.assertIsNone(table.get("b"))
+        self.assertEqual(table.get("a"), 1)
+
+    def test_transpositions_share_a_hash(self):
+        ai = game.game_ai.GameAI()
+        cells = [EMPTY_TILE] * 36
+        hand = [3, 7, 12, 12]
+        h = ai.keys.hash(cells, hand)
+        # Play the same two tiles in either order
+        first_hand, first_h = ai._play(list(cells), hand, h, ((0, 3),))
+        first_hand, first_h = ai._play(list(cells), first_hand, first_h, ((1, 7),))
+        second_hand, second_h = ai._play(list(cells), hand, h, ((1, 7),))
+        second_hand, second_h = ai._play(list(cells), second_hand, second_h, ((0, 3),))
+        self.assertEqual(first_h, second_h)
+        board = list(cells)
+        board[0], board[1] = 3, 7
+        self.assertEqual(first_h, ai.keys.hash(board, [12, 12]))
+        self.assertNotEqual(first_h, ai.keys.hash(board, [12]))
+
+    def test_search_finds_best_move(self):
+        board = empty_board()
+        for y in range(4):
+            board[0, y] = tile_code("Pink", game.game_utils.COLORS[y])
+        hand = [tile_code("Pink", "Aqua"), tile_code("Pink", "Green")]
+        hand.append(tile_code("Blue", "Blue"))
+        result = game.game_ai.GameAI(max_depth=1).search(board, hand, time_budget=1.0)
+        # Completing the pink row beats everything else
+        self.assertEqual(len(result.move), 2)
+        self.assertEqual(result.score, 6 + game.game_rules.LINE_BONUS)
+        self.assertTrue(game.game_rules.is_legal_move(board, hand, result.move))
+
+    def test_search_respects_time_budget(self):
+        hand = [tile_code("Pink", color) for color in game.game_utils.COLORS]
+        result = game.game_ai.GameAI().search(empty_board(), hand, time_budget=0.01)
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.elapsed, 0.1)
+
+    def test_no_moves(self):
+        board = empty_board()
+        board[0, 0] = tile_code("Pink", "Pink")
+        result = game.game_ai.GameAI().search(board, [tile_code("Blue", "Blue")])
+        self.assertIsNone(result.move)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import numpy as np
+import pyglet
+from pathlib import Path
+import game.game_setup
+import game.game_actions
+import game.game_animation
+from game.game_animation import Easing
+from game.game_utils import SpaceStatus
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+pyglet.resource.path = [f"{repo_dir}/resources"]
+pyglet.resource.reindex()
+
+
+class TestTweenEngine(unittest.TestCase):
+    """
+    Unit tests for animating tile movement
+    """
+
+    def setUp(self):
+        ### Initialize game ###
+        self.game_board = game.game_setup.GameBoard()
+        self.game_tiles = game.game_setup.TilePool()
+        self.game_board.add_game_board_sprite()
+        self.game_board.define_board_spaces()
+
+        ### Initialize Hand ###
+        self.player_hand = game.game_setup.PlayerHand()
+        self.player_hand = self.game_tiles.pull_new_hand(self.player_hand)
+        self.game_board = self.player_hand.build_hand_tiles_sprites(self.game_board)
+        self.tweens = game.game_animation.TweenEngine(capacity=2)
+
+    def test_easing_end_points(self):
+        easing = np.array([easing.value for easing in Easing])
+        np.testing.assert_allclose(game.game_animation.ease(np.zeros(4), easing), 0)
+        np.testing.assert_allclose(game.game_animation.ease(np.ones(4), easing), 1)
+
+    def test_tween_moves_whole_tile(self):
+        tile = self.game_board.player_hand[0]
+        start_x = tile.x
+        self.tweens.add(tile, x=start_x + 100, duration=1.0, easing=Easing.Linear)
+        self.tweens.update(0.5)
+        self.assertAlmostEqual(tile.x, start_x + 50)
+        self.assertAlmostEqual(tile.block.x, start_x + 50)
+        self.assertAlmostEqual(tile.gem.x, start_x + 50)
+
+    def test_finished_tweens_drop_out(self):
+        for idx, tile in enumerate(self.game_board.player_hand):
+            self.tweens.add(tile, x=100, y=200, scale=2, duration=0.1 * (idx + 1))
+        self.assertEqual(len(self.tweens), len(self.game_board.player_hand))
+        self.tweens.update(0.25)
+        self.assertEqual(len(self.tweens), len(self.game_board.player_hand) - 2)
+        for tile in self.game_board.player_hand[:2]:
+            self.assertNotIn(tile, self.tweens)
+            self.assertEqual((tile.x, tile.y, tile.scale), (100, 200, 2))
+        self.tweens.update(1.0)
+        self.assertEqual(len(self.tweens), 0)
+
+    def test_new_tween_replaces_old(self):
+        tile = self.game_board.player_hand[0]
+        self.tweens.add(tile, x=100, duration=1.0)
+        self.tweens.add(tile, x=300, duration=1.0)
+        self.assertEqual(len(self.tweens), 1)
+        self.tweens.update(1.0)
+        self.assertEqual(tile.x, 300)
+
+    def test_cancel(self):
+        first, second, third = self.game_board.player_hand[:3]
+        for tile in (first, second, third):
+            self.tweens.add(tile, y=500, duration=1.0)
+        self.tweens.cancel(first)
+        self.tweens.update(1.0)
+        self.assertNotEqual(first.y, 500)
+        self.assertEqual((second.y, third.y), (500, 500))
+
+    def test_board_update_runs_tweens(self):
+        tile = self.game_board.player_hand[0]
+        self.game_board.tweens.add(tile, x=10, y=10, duration=0.01)
+        self.game_board.update(1 / 60)
+        self.assertEqual((tile.x, tile.y), (10, 10))
+
+    def test_picker_refiled_when_done(self):
+        tile = self.game_board.player_hand[0]
+        picker = self.game_board.tile_picker
+        filed = list(picker.tile_cells[tile])
+        self.tweens.add(tile, x=tile.x + 300, y=tile.y + 300, duration=1.0)
+        self.tweens.update(0.5)
+        # Left in its grid cells while moving, re-filed once it stopped
+        self.assertEqual(picker.tile_cells[tile], filed)
+        self.tweens.update(0.5)
+        self.assertNotEqual(picker.tile_cells[tile], filed)
+        self.assertIs(picker.pick(tile.x, tile.y + tile.block.height / 2), tile)
+
+    def test_release_shrinks_over_ticks(self):
+        tile = self.game_board.player_hand[0]
+        game.game_actions.click_tile_make_active(tile.x, tile.y + 1, tile)
+        tile.on_mouse_drag(0, 0, 30, 40, None, None)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        # Let go off the board, the tile shrinks back to hand size frame by frame
+        scales = [tile.scale]
+        for _ in range(12):
+            self.game_board.update(1 / 60)
+            scales.append(tile.scale)
+        self.assertEqual(scales[0], self.player_hand.hand_scale * 2)
+        self.assertTrue(all(a > b for a, b in zip(scales, scales[1:9])))
+        self.assertEqual(scales[-1], self.player_hand.hand_scale)
+        self.assertNotIn(tile, self.game_board.tweens)
+
+    def test_snap_glides_onto_space(self):
+        tile = self.game_board.player_hand[0]
+        space = self.game_board.board_spaces[2, 3]
+        game.game_actions.click_tile_make_active(tile.x, tile.y + 1, tile)
+        space.space_status = SpaceStatus.Selected
+        self.game_board.on_mouse_drag(0, 0, 0, 0, None, None)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        self.assertEqual(tile.board_coord, (2, 3))
+        positions = [(tile.x, tile.y)]
+        for _ in range(12):
+            self.game_board.update(1 / 60)
+            positions.append((tile.x, tile.y))
+        self.assertNotEqual(positions[0], space.vertex_list[0])
+        self.assertNotIn(space.vertex_list[0], positions[:5])
+        self.assertEqual(positions[-1], space.vertex_list[0])
+
+    def test_undo_stops_glide(self):
+        tile = self.game_board.player_hand[0]
+        start = (tile.x, tile.y, tile.scale)
+        game.game_actions.click_tile_make_active(tile.x, tile.y + 1, tile)
+        self.game_board.board_spaces[2, 3].space_status = SpaceStatus.Selected
+        self.game_board.on_mouse_drag(0, 0, 0, 0, None, None)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        self.game_board.update(1 / 60)
+        # Undo puts the tile back in hand right away, the glide doesn't resume
+        key = pyglet.window.key
+        self.game_board.on_key_press(key.Z, key.MOD_ACCEL)
+        self.game_board.update(1.0)
+        self.assertEqual((tile.x, tile.y, tile.scale), start)
+
+
+if __name__ == "__main__":
+    unittest.main()
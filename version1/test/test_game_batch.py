@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from game.game_utils import TileStatus, SpaceStatus
+import game.game_rules
+import game.game_batch
+
+
+class TestBatchGameState(unittest.TestCase):
+    """
+    Unit tests for stepping many games at once, checked against game_rules
+    """
+
+    def setUp(self):
+        self.state = game.game_batch.BatchGameState(8, seed=0)
+
+    def test_initial_hands(self):
+        self.assertTrue((self.state.hand_codes >= 0).all())
+        self.assertTrue((self.state.bag_counts == 108 - self.state.hand_size).all())
+        self.assertTrue(
+            (
+                (self.state.tile_status == TileStatus.Hand.value).sum(axis=1)
+                == self.state.hand_size
+            ).all()
+        )
+
+    def test_legal_mask_matches_rules(self):
+        for _ in range(10):
+            mask = self.state.legal_mask()
+            for g in range(self.state.no_games):
+                hand = self.state.hand_codes[g].tolist()
+                expected = {
+                    move
+                    for move in game.game_rules.generate_moves(
+                        self.state.boards[g], [code for code in hand if code >= 0]
+                    )
+                    if len(move) == 1
+                }
+                found = {
+                    ((*divmod(int(cell), self.state.tiles_per_row), hand[slot]),)
+                    for slot, cell in zip(*np.nonzero(mask[g]))
+                }
+                self.assertEqual(found, expected)
+            self.state.apply_moves(*self.state.random_moves(mask))
+
+    def test_apply_moves_scores_and_status(self):
+        for _ in range(10):
+            slots, cells = self.state.random_moves()
+            expected = [
+                game.game_rules.score_move(
+                    self.state.boards[g],
+                    (
+                        (
+                            *divmod(int(cells[g]), self.state.tiles_per_row),
+                            int(self.state.hand_codes[g, slots[g]]),
+                        ),
+                    ),
+                )
+                if slots[g] >= 0
+                else 0
+                for g in range(self.state.no_games)
+            ]
+            self.assertEqual(self.state.apply_moves(slots, cells).tolist(), expected)
+        placed = (self.state.tile_status == TileStatus.BoardPlaced.value).sum(axis=1)
+        occupied = (self.state.space_status() == SpaceStatus.Occupied.value).sum(
+            axis=(1, 2)
+        )
+        self.assertEqual(placed.tolist(), occupied.tolist())
+
+    def test_games_finish(self):
+        while not self.state.finished.all():
+            self.state.step_random()
+        self.assertFalse(self.state.legal_mask().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
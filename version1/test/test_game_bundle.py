@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import pyglet
+from pathlib import Path
+import game.game_bundle
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+resources_dir = f"{repo_dir}/resources"
+
+
+class TestAssetBundle(unittest.TestCase):
+    """
+    Unit tests for baking PNGs into a texture bundle and reading it back
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for name in game.game_bundle.asset_file_names():
+            shutil.copy(os.path.join(resources_dir, name), self.tmp_dir)
+        game.game_bundle.bake(self.tmp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_bundle_matches_pngs(self):
+        bundle = game.game_bundle.read_bundle(self.tmp_dir)
+        self.assertEqual(set(bundle), set(game.game_bundle.asset_file_names()))
+        for name, region in bundle.items():
+            png = pyglet.image.load(os.path.join(self.tmp_dir, name)).get_image_data()
+            baked = region.get_image_data()
+            self.assertEqual((baked.width, baked.height), (png.width, png.height))
+            self.assertEqual(
+                baked.get_data("RGBA", baked.width * 4),
+                png.get_data("RGBA", png.width * 4),
+                f"{name} pixels differ",
+            )
+
+    def test_anchors_and_colors(self):
+        bundle = game.game_bundle.read_bundle(self.tmp_dir)
+        block = bundle["Block_Pink.png"]
+        self.assertEqual(block.anchor_x, block.width / 2)
+        self.assertEqual(block.color, "Pink")
+        board = bundle["GameBoard.png"]
+        self.assertEqual(
+            (board.anchor_x, board.anchor_y), (board.width / 2, board.height / 2)
+        )
+
+    def test_missing_bundle(self):
+        os.remove(os.path.join(self.tmp_dir, game.game_bundle.BUNDLE_DATA))
+        self.assertIsNone(game.game_bundle.read_bundle(self.tmp_dir))
+
+    def test_stale_bundle(self):
+        index_path = os.path.join(self.tmp_dir, game.game_bundle.BUNDLE_INDEX)
+        with open(index_path) as file:
+            index = json.load(file)
+        index["images"]["Gem_Aqua.png"]["sha1"] = "0" * 40
+        with open(index_path, "w") as file:
+            json.dump(index, file)
+        self.assertIsNone(game.game_bundle.read_bundle(self.tmp_dir))
+
+    def test_image_falls_back_to_pngs(self):
+        pyglet.resource.path = [resources_dir]
+        pyglet.resource.reindex()
+        image = game.game_bundle.image("Block_Pink.png")
+        self.assertEqual((image.width, image.height), (38, 30))
+
+    def test_image_uses_bundle(self):
+        pyglet.resource.path = [self.tmp_dir]
+        pyglet.resource.reindex()
+        try:
+            image = game.game_bundle.image("Gem_Blue.png")
+            self.assertIs(
+                image, game.game_bundle._bundles[self.tmp_dir]["Gem_Blue.png"]
+            )
+        finally:
+            pyglet.resource.path = [resources_dir]
+            pyglet.resource.reindex()
+
+
+if __name__ == "__main__":
+    unittest.main()
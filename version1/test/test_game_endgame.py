@@ -0,0 +1,126 @@
+import unittest
+import random
+import numpy as np
+from game.game_utils import COLORS, EMPTY_TILE, tile_code
+import game.game_rules
+import game.game_endgame
+
+
+def empty_board(tiles_per_row: int = 6):
+    return np.full((tiles_per_row, tiles_per_row), EMPTY_TILE, dtype=np.int8)
+
+
+def brute_force_value(board, hand) -> int:
+    """Best total score, trying every sequence of moves"""
+    best = 0
+    for move in game.game_rules.generate_moves(board, hand):
+        next_board, next_hand = game.game_rules.apply_move(board, hand, move)
+        best = max(
+            best,
+            game.game_rules.score_move(board, move)
+            + brute_force_value(next_board, next_hand),
+        )
+    return best
+
+
+class TestEndgameSolver(unittest.TestCase):
+    """
+    Unit tests for the bitboard endgame solver
+    """
+
+    def setUp(self):
+        self.board = empty_board()
+        for y in range(4):
+            self.board[0, y] = tile_code("Pink", COLORS[y])
+        self.board[1, 2] = tile_code("Aqua", "Indigo")
+        self.hand = [tile_code("Pink", "Aqua"), tile_code("Pink", "Green")]
+        self.hand += [tile_code("Blue", "Blue"), tile_code("Aqua", "Blue")]
+
+    def play(self, result) -> int:
+        """Checks every move of a result is legal, returns the points they score"""
+        board, hand, value = self.board, self.hand, 0
+        for move in result.moves:
+            self.assertTrue(game.game_rules.is_legal_move(board, hand, move))
+            value += game.game_rules.score_move(board, move)
+            board, hand = game.game_rules.apply_move(board, hand, move)
+        return value
+
+    def test_bitboard_round_trip(self):
+        cells = self.board.ravel().tolist()
+        bitboard = game.game_endgame.BitBoard.from_cells(cells, 6)
+        self.assertEqual([bitboard.code_at(cell) for cell in range(36)], cells)
+        bitboard.remove(0, cells[0])
+        self.assertEqual(bitboard.code_at(0), EMPTY_TILE)
+        self.assertEqual(bitboard.occupied.bit_count(), 4)
+
+    def test_solves_exactly(self):
+        result = game.game_endgame.EndgameSolver().solve(self.board, self.hand)
+        self.assertTrue(result.complete)
+        self.assertEqual(result.value, brute_force_value(self.board, self.hand))
+        self.assertEqual(self.play(result), result.value)
+        self.assertGreater(result.nodes_per_second, 0)
+
+    def test_node_budget(self):
+        result = game.game_endgame.EndgameSolver().solve(
+            self.board, self.hand, max_nodes=2
+        )
+        # Out of budget, the best line found so far is still playable
+        self.assertFalse(result.complete)
+        self.assertEqual(self.play(result), result.value)
+
+    def test_gap_between_runs(self):
+        # Filling the gap would join two runs that both hold a Pink/Pink
+        board = empty_board()
+        board[0, 0] = board[0, 2] = tile_code("Pink", "Pink")
+        hand = [tile_code("Pink", "Blue")]
+        solver = game.game_endgame.EndgameSolver()
+        bitboard = game.game_endgame.BitBoard.from_cells(board.ravel().tolist(), 6)
+        moves = {
+            tuple((*divmod(cell, 6), code) for cell, code in move)
+            for move in solver._iter_moves(bitboard, tuple(hand))
+        }
+        self.assertEqual(moves, set(game.game_rules.generate_moves(board, hand)))
+        self.assertNotIn(((0, 1, hand[0]),), moves)
+        result = solver.solve(board, hand)
+        for move in result.moves:
+            self.assertTrue(game.game_rules.is_legal_move(board, hand, move))
+            board, hand = game.game_rules.apply_move(board, hand, move)
+
+    def test_moves_match_rules(self):
+        # Tiles scattered over the board leave gaps between runs, where moves join lines
+        rng = random.Random(0)
+        solver = game.game_endgame.EndgameSolver()
+        for _ in range(200):
+            cells = [EMPTY_TILE] * 36
+            for cell in rng.sample(range(36), rng.randint(4, 16)):
+                cells[cell] = rng.randrange(36)
+                if not game.game_rules.cell_is_legal(cells, 6, cell):
+                    cells[cell] = EMPTY_TILE
+            board = np.array(cells, dtype=np.int8).reshape(6, 6)
+            hand = rng.sample(list(range(36)) * 3, 3)
+            bitboard = game.game_endgame.BitBoard.from_cells(cells, 6)
+            moves = {
+                tuple((*divmod(cell, 6), code) for cell, code in move): move
+                for move in solver._iter_moves(bitboard, tuple(hand))
+            }
+            rule_moves = game.game_rules.generate_moves(board, hand)
+            self.assertEqual(set(moves), set(rule_moves))
+            for move in rule_moves:
+                self.assertEqual(
+                    solver._score(bitboard, moves[move]),
+                    game.game_rules.score_move(board, move),
+                )
+
+    def test_no_moves(self):
+        board = empty_board()
+        board[0, 0] = tile_code("Pink", "Pink")
+        result = game.game_endgame.EndgameSolver().solve(
+            board, [tile_code("Blue", "Blue")]
+        )
+        self.assertEqual(result.moves, [])
+        self.assertEqual(result.value, 0)
+        self.assertTrue(result.complete)
+
+
+if __name__ == "__main__":
+    unittest.main()
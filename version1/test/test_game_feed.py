@@ -0,0 +1,178 @@
+import unittest
+import os
+import socket
+import pyglet
+from pathlib import Path
+import game.game_setup
+import game.game_replay
+import game.game_feed
+from game.game_utils import EMPTY_TILE, TileStatus
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+pyglet.resource.path = [f"{repo_dir}/resources"]
+pyglet.resource.reindex()
+
+
+def receive(connection: socket.socket) -> bytes:
+    """Everything the hub has sent so far"""
+    data = b""
+    while True:
+        try:
+            data += connection.recv(65536)
+        except BlockingIOError:
+            return data
+
+
+class TestFeedEncoding(unittest.TestCase):
+    """
+    Unit tests for keyframes, deltas and decoding them
+    """
+
+    def setUp(self):
+        self.cells = [EMPTY_TILE] * 36
+        self.hand = [3, 7, 12, 12, 20, 35]
+        self.encoder = game.game_feed.FeedEncoder(game_id=4, keyframe_interval=3)
+        self.decoder = game.game_feed.FeedDecoder()
+
+    def play(self, cell: int, slot: int, new_code: int):
+        """Place a tile from hand and refill its slot"""
+        self.cells[cell] = self.hand[slot]
+        self.hand[slot] = new_code
+        return self.encoder.encode(self.cells, self.hand, 50)
+
+    def test_delta_only_holds_changes(self):
+        keyframe = self.encoder.encode(self.cells, self.hand, 51)
+        delta = self.play(14, 2, 30)
+        self.assertLess(len(delta), len(keyframe))
+        kind, game_id, sequence, bag_count, cells, slots = game.game_feed.decode(delta)
+        self.assertEqual((kind, game_id, sequence), (game.game_feed.DELTA, 4, 1))
+        self.assertEqual((bag_count, cells, slots), (50, [(14, 12)], [(2, 30)]))
+        # Nothing changed, nothing to send
+        self.assertIsNone(self.encoder.encode(self.cells, self.hand, 50))
+
+    def test_decoder_follows_the_game(self):
+        data = self.encoder.encode(self.cells, self.hand, 51)
+        for move in range(4):
+            data += self.play(move, move, 20 + move)
+        # Bytes can arrive split anywhere
+        self.decoder.feed(data[:10])
+        self.assertEqual(self.decoder.feed(data[10:]), {4})
+        view = self.decoder.games[4]
+        self.assertEqual(view.cells, self.cells)
+        self.assertEqual(view.hand, self.hand)
+        self.assertEqual(view.bag_count, 50)
+        self.assertEqual(view.sequence, 4)
+
+    def test_gap_waits_for_keyframe(self):
+        self.decoder.feed(self.encoder.encode(self.cells, self.hand, 51))
+        self.play(0, 0, 1)  # lost
+        self.decoder.feed(self.play(1, 1, 2))
+        self.assertNotIn(4, self.decoder.games)
+        self.assertEqual(self.decoder.skipped, 1)
+        # Message 3 is a keyframe, back in sync
+        keyframe = self.play(2, 2, 3)
+        self.assertEqual(game.game_feed.decode(keyframe)[0], game.game_feed.KEYFRAME)
+        self.decoder.feed(keyframe)
+        self.assertEqual(self.decoder.games[4].cells, self.cells)
+
+
+class TestFeedHub(unittest.TestCase):
+    """
+    Unit tests for fanning messages out to subscribers
+    """
+
+    def setUp(self):
+        self.hub = game.game_feed.FeedHub()
+        self.encoder = game.game_feed.FeedEncoder(game_id=1)
+        self.cells = [EMPTY_TILE] * 36
+        self.hand = [1, 2, 3, 4, 5, 6]
+        self.connections = []
+
+    def tearDown(self):
+        self.hub.close()
+        for connection in self.connections:
+            connection.close()
+
+    def connect(self) -> socket.socket:
+        hub_end, connection = socket.socketpair()
+        connection.setblocking(False)
+        self.hub.subscribe(hub_end)
+        self.connections.append(connection)
+        return connection
+
+    def publish_move(self, cell: int):
+        self.cells[cell] = self.hand[cell % 6]
+        self.hub.publish(self.encoder.encode(self.cells, self.hand, 90 - cell))
+        self.hub.pump()
+
+    def test_fan_out_and_late_join(self):
+        early = self.connect()
+        self.hub.publish(self.encoder.encode(self.cells, self.hand, 90))
+        self.publish_move(0)
+        late = self.connect()
+        self.hub.pump()
+        self.publish_move(1)
+        early_data, late_data = receive(early), receive(late)
+        # The late subscriber gets the keyframe and deltas it missed, then the live feed
+        self.assertEqual(early_data, late_data)
+        decoder = game.game_feed.FeedDecoder()
+        decoder.feed(late_data)
+        self.assertEqual(decoder.games[1].cells, self.cells)
+        self.assertEqual(decoder.games[1].bag_count, 89)
+
+    def test_pipe_subscriber(self):
+        read_end, write_end = os.pipe()
+        self.hub.subscribe(write_end)
+        self.hub.publish(self.encoder.encode(self.cells, self.hand, 90))
+        self.publish_move(3)
+        decoder = game.game_feed.FeedDecoder()
+        decoder.feed(os.read(read_end, 65536))
+        os.close(read_end)
+        self.assertEqual(decoder.games[1].cells, self.cells)
+
+    def test_slow_subscriber_dropped(self):
+        self.hub.max_backlog = 1024
+        self.connect()  # Never reads
+        self.hub.subscribers[0].stream.setsockopt(
+            socket.SOL_SOCKET, socket.SO_SNDBUF, 4096
+        )
+        for bag_count in range(10000):
+            self.hub.publish(self.encoder.encode(self.cells, self.hand, bag_count))
+        self.hub.pump()
+        self.assertEqual(self.hub.subscribers, [])
+        self.assertEqual(self.hub.dropped, 1)
+
+
+class TestGameSnapshot(unittest.TestCase):
+    """
+    Read the feed's state off of a game
+    """
+
+    def test_snapshot(self):
+        game_board = game.game_setup.GameBoard(
+            game_window=game.game_replay.ReplayWindow(),
+            player_hand=[],
+            batch=pyglet.graphics.Batch(),
+        )
+        game_tiles = game.game_setup.TilePool()
+        player_hand = game_tiles.pull_new_hand(game.game_setup.PlayerHand())
+        game_board = player_hand.build_hand_tiles_sprites(game_board)
+        tile = game_board.player_hand[0]
+        tile.tile_status = TileStatus.BoardPlaced
+        tile.game_piece_info.tile_status = TileStatus.BoardPlaced
+        tile.board_coord = (2, 3)
+
+        cells, hand, bag_count = game.game_feed.game_snapshot(
+            game_board, player_hand, game_tiles
+        )
+        code = game.game_utils.tile_code(tile.block_color_str, tile.gem_color_str)
+        self.assertEqual(cells[2 * 6 + 3], code)
+        self.assertEqual(hand[0], EMPTY_TILE)
+        self.assertNotIn(EMPTY_TILE, hand[1:])
+        self.assertEqual(bag_count, len(game_tiles.tiles))
+
+
+if __name__ == "__main__":
+    unittest.main()
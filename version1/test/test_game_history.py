@@ -0,0 +1,112 @@
+import unittest
+import pyglet
+from pathlib import Path
+import game.game_setup
+import game.game_actions
+import game.game_history
+from game.game_utils import TileStatus, SpaceStatus
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+pyglet.resource.path = [f"{repo_dir}/resources"]
+pyglet.resource.reindex()
+
+
+class TestMoveHistory(unittest.TestCase):
+    """
+    Unit tests for undoing and redoing tile moves
+    """
+
+    def setUp(self):
+        ### Initialize game ###
+        self.game_board = game.game_setup.GameBoard()
+        self.game_board.history = game.game_history.MoveHistory(max_moves=4)
+        self.game_tiles = game.game_setup.TilePool()
+
+        ### Place Gameboard ###
+        self.game_board.add_game_board_sprite()
+        self.game_board.define_board_spaces()
+
+        ### Initialize Hand ###
+        self.player_hand = game.game_setup.PlayerHand()
+        self.player_hand = self.game_tiles.pull_new_hand(self.player_hand)
+        self.game_board = self.player_hand.build_hand_tiles_sprites(self.game_board)
+
+    def place_tile(self, tile, space_coord=(0, 0)):
+        """Click a tile, drag it over a board space and let go"""
+        game.game_actions.click_tile_make_active(
+            tile.x, tile.y + tile.block.height / 2, tile
+        )
+        self.game_board.board_spaces[space_coord].space_status = SpaceStatus.Selected
+        self.game_board.on_mouse_drag(0, 0, 0, 0, None, None)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        self.game_board.board_spaces[space_coord].space_status = SpaceStatus.Free
+        # Let it glide onto the space
+        self.game_board.update(1.0)
+
+    def test_undo_placement(self):
+        tile = self.game_board.player_hand[0]
+        x, y, scale = tile.x, tile.y, tile.scale
+        self.place_tile(tile)
+        self.assertIs(tile.tile_status, TileStatus.BoardPlaced)
+        self.assertEqual(tile.board_coord, (0, 0))
+
+        self.game_board.history.undo()
+        self.assertIs(tile.tile_status, TileStatus.Hand)
+        self.assertIs(tile.game_piece_info.tile_status, TileStatus.Hand)
+        self.assertIsNone(tile.board_coord)
+        self.assertEqual((tile.x, tile.y, tile.scale), (x, y, scale))
+        self.assertEqual((tile.block.x, tile.gem.y), (x, y))
+
+    def test_redo_placement(self):
+        tile = self.game_board.player_hand[0]
+        self.place_tile(tile)
+        placed = (tile.x, tile.y, tile.scale)
+        self.game_board.history.undo()
+        self.game_board.history.redo()
+        self.assertIs(tile.tile_status, TileStatus.BoardPlaced)
+        self.assertEqual((tile.x, tile.y, tile.scale), placed)
+        self.assertFalse(self.game_board.history.can_redo())
+
+    def test_new_move_clears_redo(self):
+        self.place_tile(self.game_board.player_hand[0])
+        self.game_board.history.undo()
+        self.place_tile(self.game_board.player_hand[1], (1, 1))
+        self.assertFalse(self.game_board.history.can_redo())
+        self.assertIsNone(self.game_board.history.redo())
+
+    def test_return_to_hand_is_undone(self):
+        tile = self.game_board.player_hand[0]
+        x, y = tile.x, tile.y
+        game.game_actions.click_tile_make_active(tile.x, tile.y + 1, tile)
+        tile.on_mouse_drag(0, 0, 30, 40, None, None)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        self.assertNotEqual((tile.x, tile.y), (x, y))
+        self.game_board.history.undo()
+        self.assertEqual((tile.x, tile.y), (x, y))
+
+    def test_click_without_move(self):
+        self.place_tile(self.game_board.player_hand[0])
+        self.game_board.history.undo()
+        # Picking a tile up and letting go where it was isn't a move
+        tile = self.game_board.player_hand[1]
+        game.game_actions.click_tile_make_active(tile.x, tile.y + 1, tile)
+        self.game_board.on_mouse_release(0, 0, None, None)
+        self.assertFalse(self.game_board.history.can_undo())
+        self.assertTrue(self.game_board.history.can_redo())
+        self.assertIs(
+            self.game_board.history.redo().game_piece, self.game_board.player_hand[0]
+        )
+
+    def test_history_is_bounded(self):
+        for idx in range(6):
+            self.place_tile(self.game_board.player_hand[idx], (idx, 0))
+        undone = 0
+        while self.game_board.history.undo() is not None:
+            undone += 1
+        self.assertEqual(undone, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import pyglet
+import game.game_hud
+
+
+class TestHud(unittest.TestCase):
+    """
+    Unit tests for HUD labels drawn in the main batch
+    """
+
+    def setUp(self):
+        self.batch = pyglet.graphics.Batch()
+        self.hud = game.game_hud.Hud(self.batch)
+        self.label = self.hud.add_label("score", text="Score: 0", x=10, y=10)
+
+    def test_label_in_batch(self):
+        self.assertIs(self.label.batch, self.batch)
+        self.assertIs(self.hud.labels["score"], self.label)
+
+    def test_set_text_only_when_changed(self):
+        self.assertFalse(self.hud.set_text("score", "Score: 0"))
+        self.assertTrue(self.hud.set_text("score", "Score: 12"))
+        self.assertEqual(self.label.text, "Score: 12")
+
+    def test_update_label(self):
+        self.assertFalse(self.hud.update_label("score", x=10, y=10))
+        self.assertTrue(self.hud.update_label("score", text="Score: 3", x=20))
+        self.assertEqual((self.label.text, self.label.x), ("Score: 3", 20))
+
+    def test_remove_label(self):
+        self.hud.remove_label("score")
+        self.assertNotIn("score", self.hud.labels)
+
+
+if __name__ == "__main__":
+    unittest.main()
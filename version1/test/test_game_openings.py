@@ -0,0 +1,118 @@
+import unittest
+import os
+import random
+import tempfile
+import numpy as np
+from game.game_utils import EMPTY_TILE, tile_code
+import game.game_rules
+import game.game_ai
+import game.game_endgame
+import game.game_openings
+
+
+def recolor(hand: list[int], rng: random.Random) -> list[int]:
+    """Same hand with block and gem colors renamed, and maybe swapped"""
+    blocks, gems = list(range(6)), list(range(6))
+    rng.shuffle(blocks)
+    rng.shuffle(gems)
+    hand = [blocks[code // 6] * 6 + gems[code % 6] for code in hand]
+    if rng.random() < 0.5:
+        hand = [(code % 6) * 6 + code // 6 for code in hand]
+    return hand
+
+
+class TestCanonicalHands(unittest.TestCase):
+    """
+    Unit tests for grouping hands that play the same
+    """
+
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.bag = list(range(36)) * 3
+
+    def test_recolored_hands_match(self):
+        for _ in range(200):
+            hand = self.rng.sample(self.bag, 6)
+            canonical, mapping = game.game_openings.canonical_hand(hand)
+            self.assertEqual(
+                canonical,
+                game.game_openings.canonical_hand(recolor(hand, self.rng))[0],
+            )
+            # Every canonical tile maps back to a tile in hand
+            self.assertEqual(sorted(mapping[code] for code in canonical), sorted(hand))
+
+    def test_different_hands_differ(self):
+        same_block = [tile_code("Pink", "Blue"), tile_code("Pink", "Aqua")]
+        nothing_shared = [tile_code("Pink", "Blue"), tile_code("Aqua", "Green")]
+        self.assertNotEqual(
+            game.game_openings.canonical_hand(same_block)[0],
+            game.game_openings.canonical_hand(nothing_shared)[0],
+        )
+
+    def test_classes_of_two_tiles(self):
+        # Two copies of a tile, two tiles sharing a color, two tiles sharing nothing
+        self.assertEqual(len(game.game_openings.canonical_hands(hand_size=2)), 3)
+
+
+class TestOpeningTable(unittest.TestCase):
+    """
+    Build a table of 3 tile openings and read from it
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmp_dir, game.game_openings.OPENINGS_FILE)
+        game.game_openings.build_table(cls.path, hand_size=3)
+        cls.table = game.game_openings.load_table(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.table
+        os.remove(cls.path)
+        os.rmdir(cls.tmp_dir)
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.bag = list(range(36)) * 3
+        self.board = np.full((6, 6), EMPTY_TILE, dtype=np.int8)
+
+    def test_lookup_matches_solver(self):
+        solver = game.game_endgame.EndgameSolver()
+        for _ in range(50):
+            hand = self.rng.sample(self.bag, 3)
+            opening = self.table.lookup(hand)
+            self.assertTrue(
+                game.game_rules.is_legal_move(self.board, hand, opening.move)
+            )
+            self.assertEqual(
+                game.game_rules.score_move(self.board, opening.move), opening.score
+            )
+            self.assertTrue(opening.complete)
+            # The solved line is played by the rules of the game and scores the value
+            result = solver.solve(self.board, hand)
+            self.assertEqual(opening.value, result.value)
+            board, rest, value = self.board, hand, 0
+            for move in result.moves:
+                self.assertTrue(game.game_rules.is_legal_move(board, rest, move))
+                value += game.game_rules.score_move(board, move)
+                board, rest = game.game_rules.apply_move(board, rest, move)
+            self.assertEqual(value, opening.value)
+
+    def test_unknown_hand(self):
+        self.assertIsNone(self.table.lookup(self.rng.sample(self.bag, 4)))
+        self.assertIsNone(game.game_openings.load_table(self.path + ".missing"))
+
+    def test_ai_reads_openings(self):
+        ai = game.game_ai.GameAI(openings=self.table)
+        hand = self.rng.sample(self.bag, 3)
+        result = ai.search(self.board, hand)
+        self.assertEqual(result.nodes, 0)
+        self.assertTrue(game.game_rules.is_legal_move(self.board, hand, result.move))
+        # Past the opening the AI searches again
+        board, hand = game.game_rules.apply_move(self.board, hand, result.move)
+        self.assertNotEqual(ai.search(board, hand + [0, 35]).nodes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
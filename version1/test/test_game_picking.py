@@ -0,0 +1,74 @@
+import unittest
+import pyglet
+from pathlib import Path
+import game.game_setup
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+pyglet.resource.path = [f"{repo_dir}/resources"]
+pyglet.resource.reindex()
+
+
+class TestTilePicker(unittest.TestCase):
+    """
+    Unit tests for finding the tile under the mouse
+    """
+
+    def setUp(self):
+        ### Initialize game ###
+        self.game_board = game.game_setup.GameBoard()
+        self.game_tiles = game.game_setup.TilePool()
+
+        ### Place Gameboard ###
+        self.game_board.add_game_board_sprite()
+        self.game_board.define_board_spaces()
+
+        ### Initialize Hand ###
+        self.player_hand = game.game_setup.PlayerHand()
+        self.player_hand = self.game_tiles.pull_new_hand(self.player_hand)
+        self.game_board = self.player_hand.build_hand_tiles_sprites(self.game_board)
+        self.picker = self.game_board.tile_picker
+
+    def test_all_hand_tiles_indexed(self):
+        self.assertEqual(len(self.picker), len(self.game_board.player_hand))
+
+    def test_pick_tile(self):
+        for tile in self.game_board.player_hand:
+            self.assertIs(self.picker.pick(tile.x, tile.y + 1), tile)
+
+    def test_pick_nothing(self):
+        self.assertIsNone(self.picker.pick(-100, -100))
+
+    def test_pick_follows_moves(self):
+        tile = self.game_board.player_hand[0]
+        old_x, old_y = tile.x, tile.y + 1
+        tile.update(x=700, y=500)
+        self.assertIs(self.picker.pick(700, 501), tile)
+        self.assertIsNot(self.picker.pick(old_x, old_y), tile)
+
+    def test_pick_topmost_of_overlapping_tiles(self):
+        bottom, top = self.game_board.player_hand[:2]
+        bottom.update(x=400, y=300)
+        top.update(x=400, y=300)
+        self.assertIs(self.picker.pick(400, 301), top)
+        bottom.block.group = pyglet.graphics.OrderedGroup(50)
+        self.assertIs(self.picker.pick(400, 301), bottom)
+
+    def test_press_activates_one_tile(self):
+        for tile in self.game_board.player_hand:
+            tile.update(x=400, y=300)
+        self.game_board.on_mouse_press(400, 301, None, None)
+        active = [tile for tile in self.game_board.player_hand if tile.active]
+        self.assertEqual(len(active), 1)
+        self.assertEqual(active[0].scale, self.player_hand.hand_scale * 2)
+
+    def test_remove_tile(self):
+        tile = self.game_board.player_hand[0]
+        self.picker.remove(tile)
+        self.assertIsNone(self.picker.pick(tile.x, tile.y + 1))
+        self.assertIsNone(tile.tile_picker)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import json
+import socket
+import tempfile
+from pathlib import Path
+import game.game_setup
+import game.game_actions
+import game.game_profiling
+from game.game_utils import SpaceStatus
+
+SQUARE = [(0, 0), (0, 10), (10, 10), (10, 0)]
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Unit tests for the opt-in profiling hooks and their sinks
+    """
+
+    def tearDown(self):
+        game.game_profiling.disable()
+
+    def test_disabled_runs_originals(self):
+        original = game.game_actions.is_board_space_selected
+        game.game_profiling.enable()
+        self.assertIsNot(game.game_actions.is_board_space_selected, original)
+        game.game_profiling.disable()
+        self.assertIs(game.game_actions.is_board_space_selected, original)
+        self.assertFalse(game.game_profiling.is_enabled())
+
+    def test_memory_sink_counts_calls(self):
+        sink = game.game_profiling.enable(trace_allocations=True)
+        for _ in range(5):
+            game.game_actions.is_board_space_selected(5, 5, SQUARE, SpaceStatus.Free)
+        summary = sink.summary()["game_actions.is_board_space_selected"]
+        self.assertEqual(summary["count"], 5)
+        self.assertGreater(summary["total"], 0)
+        self.assertLessEqual(summary["p50"], summary["p99"])
+
+    def test_board_handlers_wrapped(self):
+        sink = game.game_profiling.enable()
+        game_board = game.game_setup.GameBoard(player_hand=[])
+        game_board.on_mouse_drag(0, 0, 0, 0, None, None)
+        summary = sink.summary()
+        self.assertEqual(summary["GameBoard.on_mouse_drag"]["count"], 1)
+        self.assertEqual(summary["game_actions.snap_tile_to_board_space"]["count"], 1)
+
+    def test_json_lines_sink(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "profile.jsonl"
+            sink = game.game_profiling.JsonLinesSink(str(path))
+            game.game_profiling.enable(sink)
+            game.game_actions.is_board_space_selected(50, 50, SQUARE, SpaceStatus.Free)
+            game.game_profiling.disable()
+            sink.close()
+            records = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["name"], "game_actions.is_board_space_selected")
+
+    def test_statsd_sink(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        sink = game.game_profiling.StatsdSink(port=receiver.getsockname()[1])
+        game.game_profiling.enable(sink)
+        game.game_actions.is_board_space_selected(5, 5, SQUARE, SpaceStatus.Free)
+        game.game_profiling.disable()
+        packet = receiver.recv(4096).decode()
+        sink.close()
+        receiver.close()
+        self.assertTrue(
+            packet.startswith("untiletled.game_actions.is_board_space_selected:")
+        )
+        self.assertTrue(packet.endswith("|ms"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import tempfile
+import pyglet
+from pathlib import Path
+import game.game_setup
+import game.game_replay
+
+# Find and Set Resources path relative to module (necessary for running tests in VSC)
+module_dir = Path(game.__file__)  # type: ignore
+repo_dir = str(module_dir.parent.absolute().parent.absolute().parent.absolute())
+pyglet.resource.path = [f"{repo_dir}/resources"]
+pyglet.resource.reindex()
+
+LEFT = pyglet.window.mouse.LEFT
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Record a drag and drop session, then replay it headlessly
+    """
+
+    def setUp(self):
+        self.seed = 1234
+        self.game_board = game.game_replay.new_game(
+            self.seed, game.game_replay.ReplayWindow()
+        )
+        self.recorder = game.game_replay.InputRecorder(self.seed)
+        self.game_board.game_window.push_handlers(self.recorder)
+
+        # Drag the first tile in hand onto board space (1, 2)
+        tile = self.game_board.player_hand[0]
+        space = self.game_board.board_spaces[1, 2]
+        target_x = (space.vertex_list[1][0] + space.vertex_list[3][0]) / 2
+        target_y = (space.vertex_list[0][1] + space.vertex_list[2][1]) / 2
+        press_x, press_y = tile.x, tile.y + tile.block.height / 2
+        dispatch_event = self.game_board.game_window.dispatch_event
+        dispatch_event("on_mouse_press", press_x, press_y, LEFT, 0)
+        steps = 5
+        for step in range(1, steps + 1):
+            x = press_x + (target_x - press_x) * step / steps
+            y = press_y + (target_y - press_y) * step / steps
+            dispatch_event("on_mouse_drag", x, y, 1, 1, LEFT, 0)
+        dispatch_event("on_mouse_release", target_x, target_y, LEFT, 0)
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "recording.json")
+        self.recorder.save(self.path, self.game_board)
+
+    def tearDown(self):
+        os.remove(self.path)
+        os.rmdir(self.tmp_dir)
+
+    def test_recording_captured_events(self):
+        recording = game.game_replay.load_recording(self.path)
+        self.assertEqual(recording["seed"], self.seed)
+        self.assertEqual(
+            [event["event"] for event in recording["events"]],
+            ["on_mouse_press"] + ["on_mouse_drag"] * 5 + ["on_mouse_release"],
+        )
+        placed = [tile for tile in recording["final_state"]["tiles"] if tile[3]]
+        self.assertEqual(placed[0][2:], ["BoardPlaced", [1, 2]])
+
+    def test_replay_reaches_same_state(self):
+        result = game.game_replay.replay(game.game_replay.load_recording(self.path))
+        self.assertEqual(
+            result.final_state, game.game_replay.game_state(self.game_board)
+        )
+        summary = result.summary()
+        self.assertEqual(summary["on_mouse_drag"]["count"], 5)
+        self.assertLessEqual(
+            summary["on_mouse_drag"]["p50"], summary["on_mouse_drag"]["max"]
+        )
+
+    def test_replay_opens_no_window(self):
+        default_window = game.game_setup._default_window
+        game.game_setup._default_window = None
+        try:
+            game.game_replay.replay(game.game_replay.load_recording(self.path))
+            self.assertIsNone(game.game_setup._default_window)
+        finally:
+            game.game_setup._default_window = default_window
+
+    def test_replay_detects_different_state(self):
+        recording = game.game_replay.load_recording(self.path)
+        recording["events"] = recording["events"][:-1]  # never let go of the tile
+        with self.assertRaises(AssertionError):
+            game.game_replay.replay(recording)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import __main__
 from pathlib import Path
 import game
 import game.game_setup
+from game.game_utils import TileStatus
 
 
 # Find and Set Resources path relative to module (necessary for running tests in VSC)
@@ -203,5 +204,71 @@ class TestGameSetup(unittest.TestCase):
         self.assertEqual(no_space, self.game_board.tiles_per_row**2)
 
 
+class TestTilePool(unittest.TestCase):
+    """
+    Unit tests for drawing, refilling and exchanging tiles
+    """
+
+    def setUp(self):
+        self.game_tiles = game.game_setup.TilePool()
+        self.player_hand = self.game_tiles.pull_new_hand(game.game_setup.PlayerHand())
+        self.full_pool = len(game.game_setup.COLORS) ** 2 * self.game_tiles.no_sets
+
+    def test_draw(self):
+        drawn = self.game_tiles.draw(4)
+        self.assertEqual(len(drawn), 4)
+        self.assertEqual(
+            len(self.game_tiles.tiles), self.full_pool - self.player_hand.hand_size - 4
+        )
+        for tile in drawn:
+            self.assertIs(tile.tile_status, TileStatus.Hand)
+            self.assertNotIn(tile, self.game_tiles.tiles)
+
+    def test_draw_empty_bag(self):
+        self.game_tiles.draw(len(self.game_tiles.tiles))
+        self.assertEqual(self.game_tiles.draw(3), [])
+
+    def test_draw_batch_negative_count(self):
+        other_tiles = game.game_setup.TilePool()
+        drawn = game.game_setup.TilePool.draw_batch(
+            [self.game_tiles, other_tiles], [-1, 3]
+        )
+        self.assertEqual([len(tiles) for tiles in drawn], [0, 3])
+
+    def test_refill(self):
+        played = self.player_hand.player_hand[:2]
+        for tile in played:
+            tile.tile_status = TileStatus.BoardPlaced
+        self.game_tiles.refill(self.player_hand)
+        self.assertEqual(len(self.player_hand.player_hand), self.player_hand.hand_size)
+        for tile in played:
+            self.assertNotIn(tile, self.player_hand.player_hand)
+        self.assertEqual(
+            len(self.game_tiles.tiles), self.full_pool - self.player_hand.hand_size - 2
+        )
+
+    def test_exchange(self):
+        returned = self.player_hand.player_hand[:3]
+        self.game_tiles.exchange(self.player_hand, returned)
+        self.assertEqual(len(self.player_hand.player_hand), self.player_hand.hand_size)
+        self.assertEqual(
+            len(self.game_tiles.tiles), self.full_pool - self.player_hand.hand_size
+        )
+        for tile in returned:
+            self.assertIs(tile.tile_status, TileStatus.Bag)
+            self.assertNotIn(tile, self.player_hand.player_hand)
+            self.assertIn(tile, self.game_tiles.tiles)
+
+    def test_exchange_tile_not_in_hand(self):
+        with self.assertRaises(ValueError):
+            self.game_tiles.exchange(self.player_hand, self.game_tiles.tiles[:1])
+
+    def test_draw_batch(self):
+        pools = [self.game_tiles, game.game_setup.TilePool()]
+        drawn = game.game_setup.TilePool.draw_batch(pools, [2, 5])
+        self.assertEqual([len(tiles) for tiles in drawn], [2, 5])
+        self.assertEqual(len(pools[1].tiles), self.full_pool - 5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,10 @@
+import os
+import numpy as np
 import pyglet
 import game.game_setup
+import game.game_profiling
+import game.game_replay
+import game.game_feed
 
 ### Define resources directory ###
 pyglet.resource.path = ["../resources"]
@@ -12,6 +17,22 @@ pyglet.font.base.Font.texture_mag_filter = pyglet.gl.GL_NEAREST  # type: ignore
 pyglet.image.Texture.default_min_filter = pyglet.gl.GL_NEAREST
 pyglet.image.Texture.default_mag_filter = pyglet.gl.GL_NEAREST
 
+### Optional profiling: set UNTILETLED_PROFILE to a .jsonl file to record call latencies ###
+# Must happen before event handlers are pushed to the window
+if os.environ.get("UNTILETLED_PROFILE"):
+    game.game_profiling.enable(
+        game.game_profiling.JsonLinesSink(os.environ["UNTILETLED_PROFILE"]),
+        trace_allocations=bool(os.environ.get("UNTILETLED_PROFILE_ALLOCATIONS")),
+    )
+
+### Optional input recording: set UNTILETLED_RECORD to a .json file ###
+# Replay it with: python -m game.game_replay <file>
+recorder = None
+if os.environ.get("UNTILETLED_RECORD"):
+    seed = int(os.environ.get("UNTILETLED_SEED", np.random.randint(2**31)))
+    np.random.seed(seed)  # Tile draws have to repeat on replay
+    recorder = game.game_replay.InputRecorder(seed)
+
 # TODO: Make this its own class if necessary
 ### Initialize game ###
 game_board = game.game_setup.GameBoard()
@@ -36,7 +57,9 @@ pyglet.resource.add_font("BAUHS93.TTF")
 pyglet.gl.glClearColor(9 / 255, 4 / 255, 10 / 255, 255)
 
 # Labels, when using a custom font, you have to use it's full name (dbl click ttf file)
-title = pyglet.text.Label(
+# Labels live in the board's batch, so they cost no extra draw calls
+game_board.hud.add_label(
+    "title",
     text="UnTILEtled",
     font_name="Bauhaus 93",
     y=game_board.game_window.height,
@@ -46,7 +69,8 @@ title = pyglet.text.Label(
     font_size=72,
 )
 
-your_hand_text = pyglet.text.Label(
+game_board.hud.add_label(
+    "your_hand",
     text="Your Hand:",
     font_name="Bauhaus 93",
     y=game_board.player_hand[3].y + 50 * player_hand.hand_scale,
@@ -56,6 +80,24 @@ your_hand_text = pyglet.text.Label(
     font_size=24,
 )
 
+### Optional state feed: set UNTILETLED_FEED to a unix socket path to stream the game ###
+# Follow it with: python -m game.game_feed <path>
+feed_hub = None
+if os.environ.get("UNTILETLED_FEED"):
+    feed_hub = game.game_feed.FeedHub()
+    feed_hub.listen(os.environ["UNTILETLED_FEED"])
+    feed_encoder = game.game_feed.FeedEncoder(game_id=0)
+
+    def publish_state(dt):
+        # Only sends something once the board, hand or bag changed
+        feed_hub.publish(
+            feed_encoder.encode(
+                *game.game_feed.game_snapshot(game_board, player_hand, game_tiles)
+            )
+        )
+        feed_hub.pump()
+
+
 import time
 
 ### Draw it ###
@@ -63,8 +105,6 @@ import time
 def on_draw():
     # draw things here
     game_board.game_window.clear()
-    title.draw()
-    your_hand_text.draw()
     game_board.batch.draw()
 
 
@@ -73,8 +113,18 @@ def on_draw():
 event_logger = pyglet.window.event.WindowEventLogger().on_mouse_press
 game_board.game_window.push_handlers(event_logger)
 game_board.add_event_handlers()
+if recorder is not None:
+    # Pushed last so it sees every event first
+    game_board.game_window.push_handlers(recorder)
 
 ### Run it ###
 if __name__ == "__main__":
     pyglet.clock.schedule_interval(game_board.update, 1 / 60)
+    if feed_hub is not None:
+        pyglet.clock.schedule_interval(publish_state, 1 / 10)
     pyglet.app.run()
+    game.game_profiling.disable()
+    if recorder is not None:
+        recorder.save(os.environ["UNTILETLED_RECORD"], game_board)
+    if feed_hub is not None:
+        feed_hub.close()